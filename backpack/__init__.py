@@ -1,3 +1,86 @@
-from .async_api.rest_api import Backpack
+from importlib import import_module
+from typing import TYPE_CHECKING
 
-__all__ = ['Backpack']
+# public names and the modules defining them, imported on first access so that
+# `import backpack` does not load aiohttp and friends until a client is needed
+_EXPORTS = {
+    'AccountPool': '.async_api.accounts',
+    'Backpack': '.async_api.rest_api',
+    'BackpackWebsocket': '.async_api.websocket',
+    'ClockSync': '.async_api.clock',
+    'Instrumentation': '.async_api.instrumentation',
+    'KLineDownloader': '.async_api.public',
+    'LocalOrderBook': '.async_api.order_book',
+    'MarketDataStore': '.async_api.store',
+    'MarketIndex': '.async_api.markets',
+    'OrderTracker': '.async_api.private',
+    'PoolSettings': '.async_api.connection',
+    'ProxyPool': '.async_api.proxy_pool',
+    'RateLimiter': '.async_api.rate_limiter',
+    'RecordingSession': '.async_api.transport',
+    'ReplaySession': '.async_api.transport',
+    'ResponseCache': '.async_api.public',
+    'RetryPolicy': '.async_api.resilience',
+    'SyncBackpack': '.sync_api',
+}
+
+# names exported under another name than in their module
+_ALIASES = {
+    'SyncBackpack': 'Backpack',
+}
+
+if TYPE_CHECKING:
+    from .async_api.rest_api import Backpack
+    from .async_api.accounts import AccountPool
+    from .async_api.websocket import BackpackWebsocket
+    from .async_api.clock import ClockSync
+    from .async_api.connection import PoolSettings
+    from .async_api.instrumentation import Instrumentation
+    from .async_api.markets import MarketIndex
+    from .async_api.order_book import LocalOrderBook
+    from .async_api.private import OrderTracker
+    from .async_api.public import KLineDownloader, ResponseCache
+    from .async_api.proxy_pool import ProxyPool
+    from .async_api.rate_limiter import RateLimiter
+    from .async_api.resilience import RetryPolicy
+    from .async_api.transport import RecordingSession, ReplaySession
+    from .async_api.store import MarketDataStore
+    from .sync_api import Backpack as SyncBackpack
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+
+    if module is None:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+    value = getattr(import_module(module, __name__), _ALIASES.get(name, name))
+    globals()[name] = value
+
+    return value
+
+
+def __dir__():
+    return sorted({*globals(), *_EXPORTS})
+
+
+__all__ = [
+    'AccountPool',
+    'Backpack',
+    'BackpackWebsocket',
+    'ClockSync',
+    'Instrumentation',
+    'KLineDownloader',
+    'LocalOrderBook',
+    'MarketDataStore',
+    'MarketIndex',
+    'OrderTracker',
+    'PoolSettings',
+    'ProxyPool',
+    'RateLimiter',
+    'RecordingSession',
+    'ReplaySession',
+    'ResponseCache',
+    'RetryPolicy',
+    'SyncBackpack',
+]
@@ -0,0 +1,102 @@
+import asyncio
+from functools import partial
+from typing import Dict, Iterable, Optional
+
+import aiohttp
+
+from .connection import ConnectionStats, PoolSettings, create_session
+from .rest_api import Backpack
+
+
+class AccountPool:
+    """
+    Manages many accounts in one event loop.
+
+    Accounts using the same proxy share one session and connection pool, while each keeps its own
+    Ed25519 signer. Operations can be fanned out across accounts with bounded parallelism.
+
+    Extra keyword arguments (e.g. ``decode``) are passed to every ``Backpack`` client. An ``instrumentation``
+    among them is attached to the shared sessions as well.
+    """
+
+    def __init__(self, pool: Optional[PoolSettings] = None, concurrency: int = 10, **client_kwargs):
+        self.pool = pool or PoolSettings()
+        self.concurrency = concurrency
+        self.client_kwargs = client_kwargs
+
+        self.accounts: Dict[str, Backpack] = {}
+        self.connection_stats: Dict[Optional[str], ConnectionStats] = {}
+        self._sessions: Dict[Optional[str], aiohttp.ClientSession] = {}
+
+    def _session(self, proxy: Optional[str]) -> aiohttp.ClientSession:
+        session = self._sessions.get(proxy)
+
+        if session is None:
+            trace_configs = [self.connection_stats[proxy].trace_config()]
+            instrumentation = self.client_kwargs.get('instrumentation')
+
+            if instrumentation is not None:
+                trace_configs.append(instrumentation.trace_config())
+
+            session = self._sessions[proxy] = create_session(proxy, self.pool, trace_configs)
+
+        return session
+
+    def add(self, name: str, api_key: str, api_secret: str, proxy: Optional[str] = None) -> Backpack:
+        """
+        Adds an account and returns its client.
+
+        :param name: account name used as key of aggregated results
+        :param api_key:
+        :param api_secret:
+        :param proxy:
+        :return:
+        """
+
+        if name in self.accounts:
+            raise ValueError(f'Account {name} already exists')
+
+        self.connection_stats.setdefault(proxy, ConnectionStats())
+
+        # the shared session is created on first use, accounts can be added outside an event loop
+        client = Backpack(api_key, api_secret, proxy, session=partial(self._session, proxy), **self.client_kwargs)
+        self.accounts[name] = client
+
+        return client
+
+    def __getitem__(self, name: str) -> Backpack:
+        return self.accounts[name]
+
+    def __len__(self):
+        return len(self.accounts)
+
+    async def gather(self, method: str, *args, accounts: Optional[Iterable[str]] = None, **kwargs) -> dict:
+        """
+        Calls ``method`` of every account client (or only of ``accounts``) with the given arguments,
+        at most ``concurrency`` accounts at a time.
+
+        Example: ``await pool.gather('cancel_all_orders', 'SOL_USDC')``
+
+        :return: the result of each account keyed by name; failed calls hold the raised exception
+        """
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+        names = list(self.accounts if accounts is None else accounts)
+
+        async def call(name: str):
+            async with semaphore:
+                return await getattr(self.accounts[name], method)(*args, **kwargs)
+
+        results = await asyncio.gather(*(call(name) for name in names), return_exceptions=True)
+
+        return dict(zip(names, results))
+
+    async def close(self):
+        for client in self.accounts.values():
+            await client.close()
+
+        for session in self._sessions.values():
+            await session.close()
+
+        self.accounts.clear()
+        self._sessions.clear()
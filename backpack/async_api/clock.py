@@ -0,0 +1,142 @@
+import asyncio
+import time
+from collections import deque
+from typing import Deque, Optional, Tuple
+
+import aiohttp
+
+from backpack.base.models import BackpackError
+
+
+class ClockSync:
+    """
+    Tracks the offset of the exchange clock from the local one by sampling ``get_system_time``.
+
+    Each sample is an NTP-style exchange: the server timestamp is compared with the midpoint of
+    the local send and receive times, and the round trip bounds the error to half of it. Of the
+    last ``samples`` measurements the one with the shortest round trip is used (the NTP clock
+    filter), so a delayed response does not skew the estimate. Samples whose round trip exceeds
+    ``max_rtt`` milliseconds are dropped.
+
+    Attached to a client with an API secret, every signed request is stamped with the corrected
+    time, which allows much smaller receive windows (see ``Signer.set_window``).
+    """
+
+    def __init__(self, client, interval: float = 60, samples: int = 8, burst: int = 4,
+                 max_rtt: Optional[float] = None):
+        self.client = client
+        self.interval = interval
+        self.burst = burst
+        self.max_rtt = max_rtt
+
+        # (offset, round trip) of recent samples, in milliseconds
+        self.samples: Deque[Tuple[float, float]] = deque(maxlen=samples)
+        self.offset = 0.0
+        self.rtt: Optional[float] = None
+
+        self._task: Optional[asyncio.Task] = None
+
+        if getattr(client, 'signer', None) is not None:
+            client.signer.clock = self
+
+    @property
+    def error(self) -> Optional[float]:
+        """
+        Upper bound of the offset error in milliseconds (half the round trip, plus the 1 ms
+        resolution of the server clock).
+        """
+
+        return None if self.rtt is None else self.rtt / 2 + 1
+
+    def now(self) -> float:
+        """
+        Current server time estimate in milliseconds.
+        """
+
+        return time.time() * 1000 + self.offset
+
+    async def _server_time(self) -> int:
+        response = await self.client.get_system_time()
+
+        # raw responses carry the timestamp as text, decoded ones as a number
+        if hasattr(response, 'text'):
+            async with response:
+                return int(await response.text())
+
+        return int(response)
+
+    async def sample(self) -> Tuple[float, float]:
+        """
+        Takes one measurement and updates the estimate.
+
+        :return: offset and round trip of the measurement, in milliseconds
+        """
+
+        start = time.perf_counter()
+        sent = time.time() * 1000
+        server = await self._server_time()
+        rtt = (time.perf_counter() - start) * 1000
+        offset = server - (sent + rtt / 2)
+
+        if self.max_rtt is None or rtt <= self.max_rtt:
+            self.samples.append((offset, rtt))
+            self.offset, self.rtt = min(self.samples, key=lambda item: item[1])
+
+        return offset, rtt
+
+    async def sync(self, count: Optional[int] = None) -> float:
+        """
+        Takes ``count`` (by default ``burst``) measurements back to back.
+
+        :return: the offset estimate in milliseconds
+        """
+
+        for _ in range(count or self.burst):
+            await self.sample()
+
+        return self.offset
+
+    async def _loop(self):
+        delay = 1
+
+        # the initial sync is retried, backing off up to ``interval``, until it succeeds
+        while True:
+            try:
+                await self.sync()
+                break
+            except (aiohttp.ClientError, asyncio.TimeoutError, BackpackError, ValueError):
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.interval)
+
+        while True:
+            await asyncio.sleep(self.interval)
+
+            try:
+                await self.sample()
+            except (aiohttp.ClientError, asyncio.TimeoutError, BackpackError, ValueError):
+                # a failed measurement keeps the previous estimate
+                pass
+
+    def start(self) -> asyncio.Task:
+        """
+        Synchronizes once (retrying until the exchange answers) and then samples the server clock
+        every ``interval`` seconds.
+
+        :return:
+        """
+
+        if self._task is None:
+            self._task = asyncio.create_task(self._loop())
+
+        return self._task
+
+    def stats(self) -> dict:
+        return {'offset': self.offset, 'rtt': self.rtt, 'error': self.error, 'samples': len(self.samples)}
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+        if getattr(self.client, 'signer', None) is not None and self.client.signer.clock is self:
+            self.client.signer.clock = None
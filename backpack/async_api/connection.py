@@ -0,0 +1,112 @@
+from typing import List, Optional
+
+import aiohttp
+
+
+class PoolSettings:
+    """
+    Connection pool settings of the client connector.
+
+    :param limit: total number of simultaneous connections (0 for no limit)
+    :param limit_per_host: simultaneous connections to the same endpoint (0 for no limit)
+    :param ttl_dns_cache: seconds resolved addresses are cached (None caches forever)
+    :param use_dns_cache: whether to cache DNS lookups at all
+    :param keepalive_timeout: seconds an idle connection is kept open for reuse
+    """
+
+    def __init__(
+            self,
+            limit: int = 100,
+            limit_per_host: int = 0,
+            ttl_dns_cache: int = 300,
+            use_dns_cache: bool = True,
+            keepalive_timeout: float = 30
+    ):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.ttl_dns_cache = ttl_dns_cache
+        self.use_dns_cache = use_dns_cache
+        self.keepalive_timeout = keepalive_timeout
+
+    def connector_kwargs(self) -> dict:
+        return {
+            'limit': self.limit,
+            'limit_per_host': self.limit_per_host,
+            'ttl_dns_cache': self.ttl_dns_cache,
+            'use_dns_cache': self.use_dns_cache,
+            'keepalive_timeout': self.keepalive_timeout,
+        }
+
+
+class ConnectionStats:
+    """
+    Counts new and reused pooled connections through aiohttp tracing.
+    """
+
+    def __init__(self):
+        self.created = 0
+        self.reused = 0
+        self.queued = 0
+        self.dns_lookups = 0
+        self.dns_cache_hits = 0
+
+    @property
+    def reuse_ratio(self) -> float:
+        total = self.created + self.reused
+
+        return self.reused / total if total else 0.0
+
+    def trace_config(self) -> aiohttp.TraceConfig:
+        trace_config = aiohttp.TraceConfig()
+
+        async def on_connection_create_end(session, ctx, params):
+            self.created += 1
+
+        async def on_connection_reuseconn(session, ctx, params):
+            self.reused += 1
+
+        async def on_connection_queued_start(session, ctx, params):
+            self.queued += 1
+
+        async def on_dns_resolvehost_end(session, ctx, params):
+            self.dns_lookups += 1
+
+        async def on_dns_cache_hit(session, ctx, params):
+            self.dns_cache_hits += 1
+
+        trace_config.on_connection_create_end.append(on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(on_connection_reuseconn)
+        trace_config.on_connection_queued_start.append(on_connection_queued_start)
+        trace_config.on_dns_resolvehost_end.append(on_dns_resolvehost_end)
+        trace_config.on_dns_cache_hit.append(on_dns_cache_hit)
+
+        return trace_config
+
+    def as_dict(self) -> dict:
+        return {
+            'created': self.created,
+            'reused': self.reused,
+            'queued': self.queued,
+            'reuse_ratio': self.reuse_ratio,
+            'dns_lookups': self.dns_lookups,
+            'dns_cache_hits': self.dns_cache_hits,
+        }
+
+
+def create_session(proxy: Optional[str], pool: PoolSettings,
+                   trace_configs: Optional[List[aiohttp.TraceConfig]] = None) -> aiohttp.ClientSession:
+    """
+    Creates a client session whose connector follows ``pool``, routed through ``proxy`` if given.
+    """
+
+    connector_kwargs = pool.connector_kwargs()
+
+    if proxy:
+        # imported only when a proxy is used
+        from aiohttp_proxy import ProxyConnector
+
+        connector = ProxyConnector.from_url(proxy, ssl=False, **connector_kwargs)
+    else:
+        connector = aiohttp.TCPConnector(ssl=False, **connector_kwargs)
+
+    return aiohttp.ClientSession(trust_env=True, connector=connector, trace_configs=trace_configs)
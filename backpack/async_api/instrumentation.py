@@ -0,0 +1,205 @@
+import asyncio
+from typing import Callable, Dict, List, Optional, Tuple
+
+import aiohttp
+
+# sub-buckets per power of two, bounding the relative error of recorded values to ~3%
+_SUB_BITS = 5
+_SUB_BUCKETS = 1 << _SUB_BITS
+
+
+class LatencyHistogram:
+    """
+    HDR-style log-linear histogram of durations recorded with microsecond resolution.
+    Memory grows with the number of distinct buckets hit, not with the number of samples.
+    """
+
+    __slots__ = ('counts', 'count', 'total', 'min', 'max')
+
+    def __init__(self):
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    @staticmethod
+    def _index(micros: int) -> int:
+        if micros < 2 * _SUB_BUCKETS:
+            return micros
+
+        shift = micros.bit_length() - _SUB_BITS - 1
+
+        return shift * _SUB_BUCKETS + (micros >> shift)
+
+    @staticmethod
+    def _lower_bound(index: int) -> int:
+        if index < 2 * _SUB_BUCKETS:
+            return index
+
+        shift = index // _SUB_BUCKETS - 1
+
+        return (index - shift * _SUB_BUCKETS) << shift
+
+    def record(self, seconds: float):
+        index = self._index(max(round(seconds * 1e6), 0))
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.total += seconds
+
+        if self.min is None or seconds < self.min:
+            self.min = seconds
+        if self.max is None or seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, percent: float) -> float:
+        """
+        Returns the duration in seconds below which ``percent`` of the samples fall.
+        """
+
+        if not self.count:
+            return 0.0
+
+        threshold = self.count * percent / 100
+        seen = 0
+
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+
+            if seen >= threshold:
+                return self._lower_bound(index) / 1e6
+
+        return self.max
+
+    def as_dict(self) -> dict:
+        return {
+            'count': self.count,
+            'mean': self.total / self.count if self.count else 0.0,
+            'min': self.min,
+            'p50': self.percentile(50),
+            'p90': self.percentile(90),
+            'p99': self.percentile(99),
+            'max': self.max,
+        }
+
+
+class Instrumentation:
+    """
+    Per-endpoint latency histograms of every request phase.
+
+    Network phases are collected with an aiohttp ``TraceConfig``: ``queued`` (waiting for a pooled
+    connection), ``dns``, ``connect`` (new connection including TLS) and ``ttfb`` (request start until
+    response headers). The client adds ``sign``, ``schedule`` (rate limiter wait) and ``body``
+    (response body read, when the client reads it).
+
+    Exporters are called with ``(endpoint, phases)`` once response headers of a request are received.
+    When a client has no instrumentation, none of this code runs.
+    """
+
+    def __init__(self, exporters: Optional[List[Callable[[str, Dict[str, float]], None]]] = None):
+        self.exporters = list(exporters or [])
+        self.histograms: Dict[Tuple[str, str], LatencyHistogram] = {}
+        self.errors: Dict[str, int] = {}
+
+    def record(self, endpoint: str, phase: str, seconds: float):
+        histogram = self.histograms.get((endpoint, phase))
+
+        if histogram is None:
+            histogram = self.histograms[(endpoint, phase)] = LatencyHistogram()
+
+        histogram.record(seconds)
+
+    def trace_config(self) -> aiohttp.TraceConfig:
+        trace_config = aiohttp.TraceConfig()
+
+        def now():
+            return asyncio.get_running_loop().time()
+
+        def endpoint(ctx, params) -> str:
+            return ctx.trace_request_ctx or params.url.path
+
+        def phase_start(name: str):
+            async def handler(session, ctx, params):
+                setattr(ctx, name, now())
+
+            return handler
+
+        def phase_end(name: str):
+            async def handler(session, ctx, params):
+                start = getattr(ctx, name, None)
+
+                if start is not None:
+                    ctx.phases[name] = now() - start
+
+            return handler
+
+        async def on_request_start(session, ctx, params):
+            ctx.start = now()
+            ctx.phases = {}
+
+        async def on_request_end(session, ctx, params):
+            phases = ctx.phases
+            phases['ttfb'] = now() - ctx.start
+            name = endpoint(ctx, params)
+
+            for phase, seconds in phases.items():
+                self.record(name, phase, seconds)
+
+            for exporter in self.exporters:
+                exporter(name, phases)
+
+        async def on_request_exception(session, ctx, params):
+            name = endpoint(ctx, params)
+            self.errors[name] = self.errors.get(name, 0) + 1
+
+        trace_config.on_request_start.append(on_request_start)
+        trace_config.on_request_end.append(on_request_end)
+        trace_config.on_request_exception.append(on_request_exception)
+
+        for phase, start_signal, end_signal in (
+                ('queued', trace_config.on_connection_queued_start, trace_config.on_connection_queued_end),
+                ('connect', trace_config.on_connection_create_start, trace_config.on_connection_create_end),
+                ('dns', trace_config.on_dns_resolvehost_start, trace_config.on_dns_resolvehost_end),
+        ):
+            start_signal.append(phase_start(phase))
+            end_signal.append(phase_end(phase))
+
+        return trace_config
+
+    def summary(self) -> Dict[str, Dict[str, dict]]:
+        result = {}
+
+        for (endpoint, phase), histogram in sorted(self.histograms.items()):
+            result.setdefault(endpoint, {})[phase] = histogram.as_dict()
+
+        return result
+
+    def prometheus(self, name: str = 'backpack_request_phase_seconds') -> str:
+        """
+        Renders the histograms as a Prometheus summary in the text exposition format.
+
+        :param name: metric name
+        :return:
+        """
+
+        lines = [
+            f'# HELP {name} Latency of Backpack API request phases.',
+            f'# TYPE {name} summary',
+        ]
+
+        for (endpoint, phase), histogram in sorted(self.histograms.items()):
+            labels = f'endpoint="{endpoint}",phase="{phase}"'
+
+            for quantile in (0.5, 0.9, 0.99):
+                lines.append(f'{name}{{{labels},quantile="{quantile}"}} {histogram.percentile(quantile * 100)}')
+
+            lines.append(f'{name}_sum{{{labels}}} {histogram.total}')
+            lines.append(f'{name}_count{{{labels}}} {histogram.count}')
+
+        if self.errors:
+            lines.append('# TYPE backpack_request_errors_total counter')
+
+        for endpoint, count in sorted(self.errors.items()):
+            lines.append(f'backpack_request_errors_total{{endpoint="{endpoint}"}} {count}')
+
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,227 @@
+import asyncio
+from typing import Dict, Optional
+
+import aiohttp
+
+from backpack.base.decoder import read_json
+from backpack.base.fixed_point import ROUND_DOWN, ROUND_NEAREST, Quantizer, decimal_places, to_scaled
+from backpack.base.models import BackpackError
+
+
+class Market:
+    """
+    Trading rules of one market with precompiled price and quantity quantizers.
+
+    Limits are kept as integers scaled to the tick size (prices) and step size (quantities),
+    so validating an order needs no decimal arithmetic.
+    """
+
+    __slots__ = (
+        'symbol', 'base', 'quote', 'price', 'quantity', 'min_price', 'max_price',
+        'min_quantity', 'max_quantity', 'min_notional', 'raw'
+    )
+
+    def __init__(self, raw: dict, min_notional: Optional[str] = None):
+        filters = raw.get('filters') or {}
+        price = filters.get('price') or {}
+        quantity = filters.get('quantity') or {}
+
+        self.raw = raw
+        self.symbol: str = raw['symbol']
+        self.base: Optional[str] = raw.get('baseSymbol')
+        self.quote: Optional[str] = raw.get('quoteSymbol')
+
+        self.price = Quantizer(price.get('tickSize') or '0.00000001')
+        self.quantity = Quantizer(quantity.get('stepSize') or '0.00000001')
+
+        self.min_price = self._limit(price.get('minPrice'), self.price)
+        self.max_price = self._limit(price.get('maxPrice'), self.price)
+        self.min_quantity = self._limit(quantity.get('minQuantity'), self.quantity)
+        self.max_quantity = self._limit(quantity.get('maxQuantity'), self.quantity)
+
+        notional = (filters.get('notional') or {}).get('minNotional') or min_notional
+        self.min_notional: Optional[str] = None if notional is None else str(notional)
+
+    @staticmethod
+    def _limit(value, quantizer: Quantizer) -> Optional[int]:
+        return None if value is None else quantizer.scaled(value)
+
+    def _notional_below_minimum(self, scaled_notional: int, decimals: int) -> bool:
+        minimum_decimals = decimal_places(self.min_notional)
+
+        if minimum_decimals > decimals:
+            scaled_notional *= 10 ** (minimum_decimals - decimals)
+            decimals = minimum_decimals
+
+        return scaled_notional < to_scaled(self.min_notional, decimals)
+
+    def prepare(self, payload: dict, round_values: bool = False) -> dict:
+        """
+        Formats the price, trigger price and quantity of an order payload to the market increments
+        and checks the market limits and minimum notional. The payload is updated in place.
+
+        Values off the tick/step grid raise ValueError unless ``round_values`` is set, in which case
+        prices are rounded to the nearest tick and quantities down to the step size.
+
+        :param payload: ``execute_order`` payload
+        :param round_values:
+        :return: the payload
+        """
+
+        price = quantity = None
+
+        for key, quantizer, rounding in (
+                ('price', self.price, ROUND_NEAREST),
+                ('triggerPrice', self.price, ROUND_NEAREST),
+                ('quantity', self.quantity, ROUND_DOWN),
+        ):
+            value = payload.get(key)
+
+            if value is None:
+                continue
+
+            if not round_values and not quantizer.is_multiple(value):
+                raise ValueError(f'{key} {value} of {self.symbol} is not a multiple of {quantizer.increment}')
+
+            scaled = quantizer.scaled(value, rounding)
+            payload[key] = quantizer(value, rounding)
+
+            if key == 'price':
+                price = scaled
+            elif key == 'quantity':
+                quantity = scaled
+
+        if price is not None:
+            if self.min_price is not None and price < self.min_price:
+                raise ValueError(f'Price {payload["price"]} of {self.symbol} is below the minimum')
+
+            if self.max_price is not None and price > self.max_price:
+                raise ValueError(f'Price {payload["price"]} of {self.symbol} is above the maximum')
+
+        if quantity is not None:
+            if quantity <= 0 or self.min_quantity is not None and quantity < self.min_quantity:
+                raise ValueError(f'Quantity {payload["quantity"]} of {self.symbol} is below the minimum')
+
+            if self.max_quantity is not None and quantity > self.max_quantity:
+                raise ValueError(f'Quantity {payload["quantity"]} of {self.symbol} is above the maximum')
+
+        if self.min_notional is not None:
+            if price is not None and quantity is not None:
+                below = self._notional_below_minimum(price * quantity, self.price.decimals + self.quantity.decimals)
+            elif payload.get('quoteQuantity') is not None:
+                quote = str(payload['quoteQuantity'])
+                below = self._notional_below_minimum(to_scaled(quote, decimal_places(quote)), decimal_places(quote))
+            else:
+                # market orders by quantity have no known notional before execution
+                below = False
+
+            if below:
+                raise ValueError(f'Order notional of {self.symbol} is below the minimum of {self.min_notional}')
+
+        return payload
+
+
+class MarketIndex:
+    """
+    Index of market rules and assets built from ``get_markets`` and ``get_assets``, refreshed
+    in the background.
+
+    Markets are looked up by symbol in O(1). Attached to a client (``Backpack(markets=...)``),
+    every order is formatted and validated by ``Market.prepare`` before it is signed, so orders
+    the exchange would reject never leave the process.
+
+    Load it with ``await index.refresh()`` and keep it current with ``index.start()``.
+
+    :param min_notional: minimum order values for markets whose filters have none, keyed by
+        market symbol or quote asset (e.g. ``{'USDC': '5'}``)
+    :param round_values: round off-grid prices and quantities instead of raising ValueError
+    """
+
+    def __init__(self, client, refresh_interval: float = 300, min_notional: Optional[Dict[str, str]] = None,
+                 round_values: bool = False):
+        self.client = client
+        self.refresh_interval = refresh_interval
+        self.min_notional = min_notional or {}
+        self.round_values = round_values
+
+        self.markets: Dict[str, Market] = {}
+        self.assets: Dict[str, dict] = {}
+
+        self._task: Optional[asyncio.Task] = None
+
+    def __getitem__(self, symbol: str) -> Market:
+        return self.markets[symbol]
+
+    def __contains__(self, symbol: str):
+        return symbol in self.markets
+
+    def __len__(self):
+        return len(self.markets)
+
+    def get(self, symbol: str) -> Optional[Market]:
+        return self.markets.get(symbol)
+
+    async def refresh(self):
+        """
+        Reloads markets and assets. The index is replaced at once, lookups never see a partial update.
+
+        :return:
+        """
+
+        markets, assets = await asyncio.gather(self.client.get_markets(), self.client.get_assets())
+        markets, assets = await asyncio.gather(read_json(markets), read_json(assets))
+
+        self.markets = {
+            market['symbol']: Market(
+                market, self.min_notional.get(market['symbol'], self.min_notional.get(market.get('quoteSymbol')))
+            )
+            for market in markets
+        }
+        self.assets = {asset['symbol']: asset for asset in assets}
+
+    def prepare(self, payload: dict) -> dict:
+        """
+        Formats and validates an order payload against its market (see ``Market.prepare``).
+        Orders of unknown markets raise ValueError once the index is loaded.
+
+        :param payload:
+        :return:
+        """
+
+        market = self.markets.get(payload['symbol'])
+
+        if market is None:
+            if self.markets:
+                raise ValueError(f'Unknown market: {payload["symbol"]}')
+
+            return payload
+
+        return market.prepare(payload, self.round_values)
+
+    async def _refresh_loop(self):
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+
+            try:
+                await self.refresh()
+            except (aiohttp.ClientError, asyncio.TimeoutError, BackpackError):
+                # the previous index stays in use
+                pass
+
+    def start(self) -> asyncio.Task:
+        """
+        Keeps refreshing the index every ``refresh_interval`` seconds. Load it first with
+        ``await index.refresh()``, until then orders are not validated.
+
+        :return:
+        """
+
+        if self._task is None:
+            self._task = asyncio.create_task(self._refresh_loop())
+
+        return self._task
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
@@ -0,0 +1,235 @@
+import asyncio
+from bisect import bisect_left
+from typing import List, Optional, Tuple
+
+import aiohttp
+
+from backpack.base.decoder import read_json
+from backpack.base.fixed_point import to_scaled
+from backpack.base.models import BackpackError
+from .websocket import BackpackWebsocket
+
+
+class BookSide:
+    """
+    One side of the order book kept as two parallel arrays sorted by ascending price.
+
+    Prices and sizes are scaled integers. For bids the best level is the last element,
+    for asks it is the first one.
+    """
+
+    __slots__ = ('prices', 'sizes', 'descending')
+
+    def __init__(self, descending: bool):
+        self.prices: List[int] = []
+        self.sizes: List[int] = []
+        self.descending = descending
+
+    def __len__(self):
+        return len(self.prices)
+
+    def clear(self):
+        self.prices.clear()
+        self.sizes.clear()
+
+    def update(self, price: int, size: int):
+        prices = self.prices
+        i = bisect_left(prices, price)
+        exists = i < len(prices) and prices[i] == price
+
+        if size == 0:
+            if exists:
+                del prices[i]
+                del self.sizes[i]
+        elif exists:
+            self.sizes[i] = size
+        else:
+            prices.insert(i, price)
+            self.sizes.insert(i, size)
+
+    def best(self) -> Optional[Tuple[int, int]]:
+        if not self.prices:
+            return None
+
+        i = -1 if self.descending else 0
+
+        return self.prices[i], self.sizes[i]
+
+    def top(self, n: int) -> List[Tuple[int, int]]:
+        if self.descending:
+            start = max(len(self.prices) - n, 0)
+            return list(zip(reversed(self.prices[start:]), reversed(self.sizes[start:])))
+
+        return list(zip(self.prices[:n], self.sizes[:n]))
+
+
+class LocalOrderBook:
+    """
+    Order book seeded from the depth snapshot and kept up to date with the ``depth`` stream.
+
+    Updates are applied in sequence. When a gap in update ids is detected the book is
+    re-seeded from a fresh snapshot automatically.
+    """
+
+    def __init__(
+            self,
+            client,
+            symbol: str,
+            websocket: Optional[BackpackWebsocket] = None,
+            price_decimals: int = 8,
+            size_decimals: int = 8,
+            resync_delay: float = 0.1,
+            max_resync_delay: float = 5
+    ):
+        self.client = client
+        self.symbol = symbol
+        self.websocket = websocket
+        self.price_decimals = price_decimals
+        self.size_decimals = size_decimals
+        self.resync_delay = resync_delay
+        self.max_resync_delay = max_resync_delay
+
+        self.bids = BookSide(descending=True)
+        self.asks = BookSide(descending=False)
+        self.last_update_id = 0
+        self.resyncs = 0
+        self.synced = asyncio.Event()
+
+        self._owns_websocket = websocket is None
+        self._task: Optional[asyncio.Task] = None
+
+    def best_bid(self) -> Optional[Tuple[int, int]]:
+        return self.bids.best()
+
+    def best_ask(self) -> Optional[Tuple[int, int]]:
+        return self.asks.best()
+
+    def spread(self) -> Optional[int]:
+        if not self.bids or not self.asks:
+            return None
+
+        return self.asks.prices[0] - self.bids.prices[-1]
+
+    def top(self, n: int) -> Tuple[List[Tuple[int, int]], List[Tuple[int, int]]]:
+        """
+        Returns the best ``n`` bid and ask levels as ``(price, size)`` pairs of scaled integers.
+
+        :param n:
+        :return:
+        """
+
+        return self.bids.top(n), self.asks.top(n)
+
+    def load_snapshot(self, snapshot: dict):
+        self.bids.clear()
+        self.asks.clear()
+
+        self._apply_levels(self.bids, snapshot['bids'])
+        self._apply_levels(self.asks, snapshot['asks'])
+
+        self.last_update_id = int(snapshot['lastUpdateId'])
+
+    def apply(self, event: dict) -> bool:
+        """
+        Applies a depth stream event. Returns False if the event does not follow
+        the last applied update and the book has to be resynced.
+
+        :param event:
+        :return:
+        """
+
+        last_id = int(event['u'])
+
+        if last_id <= self.last_update_id:
+            return True
+
+        if int(event['U']) > self.last_update_id + 1:
+            return False
+
+        self._apply_levels(self.bids, event['b'])
+        self._apply_levels(self.asks, event['a'])
+        self.last_update_id = last_id
+
+        return True
+
+    def _apply_levels(self, side: BookSide, levels: list):
+        for price, size in levels:
+            side.update(to_scaled(price, self.price_decimals), to_scaled(size, self.size_decimals))
+
+    async def resync(self, min_update_id: int = 0):
+        """
+        Re-seeds the book from a depth snapshot. Snapshots older than ``min_update_id`` cannot be
+        continued by the buffered events, and failed requests leave no snapshot at all; in both cases
+        the snapshot is fetched again, backing off from ``resync_delay`` up to ``max_resync_delay``
+        seconds. Stream events keep queueing meanwhile.
+
+        :param min_update_id:
+        :return:
+        """
+
+        self.synced.clear()
+        delay = self.resync_delay
+
+        while True:
+            try:
+                snapshot = await read_json(await self.client.get_order_book_depth(self.symbol))
+            except (aiohttp.ClientError, asyncio.TimeoutError, BackpackError):
+                # retried after the delay, the book stays unsynced meanwhile
+                pass
+            else:
+                self.load_snapshot(snapshot)
+                self.resyncs += 1
+
+                if self.last_update_id >= min_update_id:
+                    break
+
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.max_resync_delay)
+
+        self.synced.set()
+
+    async def run(self):
+        """
+        Keeps the book in sync until cancelled or the stream ends. Stream events received while
+        the snapshot is being fetched are buffered and applied afterwards.
+
+        :return:
+        """
+
+        if self.websocket is None:
+            self.websocket = self.client.websocket()
+
+        stream = await self.websocket.depth(self.symbol)
+
+        try:
+            await self.resync()
+
+            async for event in stream:
+                if not self.apply(event):
+                    # the snapshot has to reach the update right before this event for it to apply
+                    await self.resync(int(event['U']) - 1)
+                    self.apply(event)
+        finally:
+            # without updates the book goes stale
+            self.synced.clear()
+            await stream.close()
+
+    def start(self) -> asyncio.Task:
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+
+        return self._task
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+            self._task = None
+
+        if self._owns_websocket and self.websocket is not None:
+            await self.websocket.close()
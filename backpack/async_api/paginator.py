@@ -0,0 +1,73 @@
+import asyncio
+from collections import deque
+from typing import AsyncIterator, Awaitable, Callable
+
+from backpack.base.decoder import read_json
+
+
+def _row_key(row, key: str):
+    raw = getattr(row, 'raw', row)
+
+    return raw.get(key)
+
+
+async def paginate(
+        fetch: Callable[[int, int], Awaitable],
+        limit: int = 100,
+        offset: int = 0,
+        prefetch: int = 2,
+        key: str = 'id'
+) -> AsyncIterator:
+    """
+    Yields the rows of a ``limit``/``offset`` paginated endpoint one by one.
+
+    Up to ``prefetch`` pages beyond the current one are requested concurrently. Rows already
+    seen on the previous page are skipped, which covers rows shifting across page boundaries
+    while history grows. Only one page is kept in memory at a time.
+
+    :param fetch: coroutine function called as ``fetch(limit, offset)``
+    :param limit: page size
+    :param offset: offset of the first page
+    :param prefetch: number of pages requested ahead
+    :param key: row field identifying duplicates
+    :return:
+    """
+
+    pending = deque()
+    next_offset = offset
+
+    def schedule():
+        nonlocal next_offset
+        pending.append(asyncio.ensure_future(fetch(limit, next_offset)))
+        next_offset += limit
+
+    for _ in range(prefetch + 1):
+        schedule()
+
+    previous_keys = set()
+
+    try:
+        while pending:
+            page = await pending.popleft()
+            # decoded pages are kept as models, raw responses are read as JSON
+            rows = page if isinstance(page, list) else await read_json(page)
+            keys = set()
+
+            for row in rows:
+                row_key = _row_key(row, key)
+                keys.add(row_key)
+
+                if row_key is None or row_key not in previous_keys:
+                    yield row
+
+            if len(rows) < limit:
+                break
+
+            previous_keys = keys
+            schedule()
+    finally:
+        for task in pending:
+            if not task.done():
+                task.cancel()
+            elif not task.cancelled() and task.exception() is None and hasattr(task.result(), 'release'):
+                task.result().release()
@@ -1,5 +1,11 @@
 from .private import BackpackPrivate
+from .signer import Signer
+from .template import OrderTemplate
+from .tracker import OrderTracker
 
 __all__ = [
-    'BackpackPrivate'
+    'BackpackPrivate',
+    'OrderTemplate',
+    'OrderTracker',
+    'Signer'
 ]
@@ -1,63 +1,57 @@
-import base64
-import time
-from typing import Callable, Optional
-from urllib.parse import urlencode
+import asyncio
+import random
+from typing import Callable, Dict, List, Optional, Tuple, Union
 
 import aiohttp
 
-from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
-from cryptography.hazmat.primitives import serialization
-from backpack.base.models import BaseClient
+from backpack.base.models import BaseClient, BackpackError, Balance, Fill, Order
+from ..paginator import paginate
+from .signer import Signer
+from .template import OrderTemplate
 
 
 class BackpackPrivate(BaseClient):
-    def __init__(self, api_key: str, api_secret: str):  # api_key is unnecessary
+    # optional MarketIndex validating orders before they are signed
+    markets = None
+
+    # api_key is unnecessary
+    def __init__(self, api_key: str, api_secret: str, windows: Optional[Dict[str, int]] = None):
         super().__init__()
 
         if api_key is not None and api_secret is None:
             raise ValueError('api_secret must be provided if api_key is provided')
+
+        self.signer: Optional[Signer] = None
+        self._templates: Dict[tuple, OrderTemplate] = {}
+
         if api_secret is not None:
-            self.private_key = Ed25519PrivateKey.from_private_bytes(base64.b64decode(api_secret))
-            self.verifying_key = self.private_key.public_key()
-            self.verifying_key_b64 = base64.b64encode(
-                self.verifying_key.public_bytes(
-                    encoding=serialization.Encoding.Raw,
-                    format=serialization.PublicFormat.Raw
-                )
-            ).decode()
+            self.signer = Signer(api_secret, windows=windows)
+            self.private_key = self.signer.private_key
+            self.verifying_key = self.signer.verifying_key
+            self.verifying_key_b64 = self.signer.verifying_key_b64
 
-    def _sign_request(self, instruction: str, body: Optional[dict] = None):
+    def _sign_request(self, instruction: str, body: Union[dict, List[dict], None] = None,
+                      encoded_body: Optional[str] = None):
         """
         Sign a request with the given instruction and optional parameters.
 
         Args:
             instruction (str): The instruction for the request.
-            body (Optional[dict]): Optional parameters for the request.
+            body (Union[dict, List[dict], None]): Optional parameters for the request,
+                or the payloads of a batch endpoint.
+            encoded_body (Optional[str]): The body already in canonical form, signed instead of ``body``.
 
         Returns:
             dict: A dictionary containing the signed request data.
         """
 
-        timestamp = str(int(time.time() * 1000))
-        window = '5000'
+        if encoded_body is not None:
+            return self.signer.sign_encoded(instruction, encoded_body)
 
-        body = {
-            'instruction': instruction,
-            **dict(sorted((body or {}).items())),
-            'timestamp': timestamp,
-            'window': window,
-        }
-        message = urlencode(body)
-        signature = self.private_key.sign(message.encode())
-        signature_b64 = base64.b64encode(signature).decode()
-
-        return {
-            'X-API-KEY': self.verifying_key_b64,
-            'X-TIMESTAMP': timestamp,
-            'X-WINDOW': window,
-            'Content-Type': 'application/json',
-            'X-SIGNATURE': signature_b64
-        }
+        if isinstance(body, list):
+            return self.signer.sign_batch(instruction, body)
+
+        return self.signer.sign(instruction, body)
 
     @staticmethod
     def sign_request(instruction: str):
@@ -93,9 +87,7 @@ class BackpackPrivate(BaseClient):
 
         url = self.API_URL + '/api/v1/capital'
 
-        headers = self._sign_request('balanceQuery')
-
-        return await self.session.get(url, headers=headers)
+        return await self._request('GET', url, model=Balance, instruction='balanceQuery')
 
     async def get_deposits(self, limit: int = 100, offset: int = 0):
         """
@@ -113,9 +105,7 @@ class BackpackPrivate(BaseClient):
             'offset': offset
         }
 
-        headers = self._sign_request('balanceQuery', body=params)
-
-        return await self.session.get(url, headers=headers, params=params)
+        return await self._request('GET', url, instruction='balanceQuery', params=params)
 
     async def get_deposit_address(self, blockchain: str) -> aiohttp.ClientResponse:
         """
@@ -132,9 +122,7 @@ class BackpackPrivate(BaseClient):
             'blockchain': blockchain.capitalize()
         }
 
-        headers = self._sign_request('depositAddressQuery', body=params)
-
-        return await self.session.get(url, headers=headers, params=params)
+        return await self._request('GET', url, instruction='depositAddressQuery', params=params)
 
     async def get_withdrawals(self, limit: int = 100, offset: int = 0):
         """
@@ -152,9 +140,7 @@ class BackpackPrivate(BaseClient):
             'offset': offset
         }
 
-        headers = self._sign_request('withdrawalQueryAll', body=params)
-
-        return await self.session.get(url, headers=headers, params=params)
+        return await self._request('GET', url, instruction='withdrawalQueryAll', params=params)
 
     async def request_withdrawal(self, address: str, blockchain: str, quantity: str, symbol: str,
                                  client_id: Optional[int] = None,
@@ -182,9 +168,7 @@ class BackpackPrivate(BaseClient):
         if two_factor_token:
             payload['twoFactorToken'] = two_factor_token
 
-        headers = self._sign_request('withdraw', body=payload)
-
-        return await self.session.post(url, headers=headers, json=payload)
+        return await self._request('POST', url, instruction='withdraw', json=payload)
 
     async def get_order_history(self, symbol: str, limit: int = 100, offset: int = 0):
         """
@@ -208,9 +192,7 @@ class BackpackPrivate(BaseClient):
             'offset': offset
         }
 
-        headers = self._sign_request('orderHistoryQueryAll', body=params)
-
-        return await self.session.get(url, headers=headers, params=params)
+        return await self._request('GET', url, model=Order, instruction='orderHistoryQueryAll', params=params)
 
     async def get_fill_history(self, order_id: str, symbol: str, limit: int = 100, offset: int = 0):
         """
@@ -234,9 +216,7 @@ class BackpackPrivate(BaseClient):
             'offset': offset
         }
 
-        headers = self._sign_request('fillHistoryQueryAll', body=params)
-
-        return await self.session.get(url, headers=headers, params=params)
+        return await self._request('GET', url, model=Fill, instruction='fillHistoryQueryAll', params=params)
 
     async def get_open_order(self, symbol: str, client_id: int = None, order_id: str = None):
         """
@@ -252,19 +232,9 @@ class BackpackPrivate(BaseClient):
 
         url = self.API_URL + '/api/v1/order'
 
-        params = {
-            'symbol': symbol
-        }
+        params = self._order_id_params(symbol, client_id, order_id)
 
-        if client_id:
-            params['clientId'] = client_id
-
-        if order_id:
-            params['orderId'] = order_id
-
-        headers = self._sign_request('orderQuery', body=params)
-
-        return await self.session.get(url, headers=headers, params=params)
+        return await self._request('GET', url, model=Order, instruction='orderQuery', params=params)
 
     async def execute_order(
             self,
@@ -283,12 +253,139 @@ class BackpackPrivate(BaseClient):
         """
         Submits an order to the matching engine for execution.
 
+        With a ``retry_policy`` the order always carries a ``clientId`` (a random one unless given). When the
+        outcome of a submission is unknown (network error, timeout or 5xx status), the order is looked up by
+        that ``clientId`` among the open orders and the latest order history and only resubmitted if it was
+        not placed. This lookup also runs after the last attempt, before its error is raised. A recovered order
+        is returned as ``Order`` when decoding and as a ``RecoveredResponse`` (with the response interface)
+        otherwise.
+
         https://docs.backpack.exchange/#tag/Order/operation/execute_order
 
         :return:
         """
         url = self.API_URL + '/api/v1/order'
 
+        payload = self._checked_payload(
+            symbol, side, order_type, price, client_id, quantity, quote_quantity, post_only,
+            self_trade_prevention, time_in_force, trigger_price
+        )
+
+        policy = self.retry_policy
+
+        if policy is None:
+            return await self._request('POST', url, model=Order, instruction='orderExecute', json=payload)
+
+        payload.setdefault('clientId', random.randint(1, 2 ** 32 - 1))
+
+        for attempt in range(policy.max_retries + 1):
+            last = attempt == policy.max_retries
+            error = None
+
+            try:
+                response = await self._request('POST', url, model=Order, instruction='orderExecute', json=payload)
+            except Exception as e:
+                if not policy.is_ambiguous(e):
+                    raise
+
+                error = e
+            else:
+                if self.decode or not policy.should_retry(response):
+                    return response
+
+                if not last:
+                    response.release()
+
+            # the order may have been placed even though the request failed, also after the last attempt
+            order = await self._find_order(payload['symbol'], payload['clientId'])
+
+            if order is not None:
+                if self.decode:
+                    return Order.decode(order)
+
+                from ..resilience import RecoveredResponse
+
+                return RecoveredResponse(url, order)
+
+            if last:
+                if error is not None:
+                    raise error
+
+                return response
+
+            await asyncio.sleep(policy.delay(attempt))
+
+    async def _find_order(self, symbol: str, client_id: int) -> Optional[dict]:
+        from backpack.base.decoder import decode_response
+
+        url = self.API_URL + '/api/v1/order'
+
+        try:
+            response = await self._fetch_with_retries(
+                'GET', url, 'orderQuery', params=self._order_id_params(symbol, client_id)
+            )
+            return await decode_response(response)
+        except BackpackError as e:
+            if e.status != 404:
+                raise
+
+        url = self.API_URL + '/wapi/v1/history/orders'
+
+        response = await self._fetch_with_retries(
+            'GET', url, 'orderHistoryQueryAll', params={'symbol': symbol, 'limit': 100, 'offset': 0}
+        )
+
+        return next((row for row in await decode_response(response) if row.get('clientId') == client_id), None)
+
+    def order_template(
+            self,
+            symbol: str,
+            side: str,
+            order_type: str,
+            time_in_force: Optional[str] = None,
+            post_only: Optional[bool] = None,
+            self_trade_prevention: Optional[str] = None
+    ) -> OrderTemplate:
+        """
+        Returns the template of orders sharing these fields, created on first use. Submitting from
+        a template only encodes the price, quantity and client id before signing.
+
+        Example: ``await client.order_template('SOL_USDC', 'buy', 'limit', 'GTC').submit('100.5', '2')``
+
+        :return:
+        """
+
+        key = (symbol, side, order_type, time_in_force, post_only, self_trade_prevention)
+        template = self._templates.get(key)
+
+        if template is None:
+            template = self._templates[key] = OrderTemplate(self, *key)
+
+        return template
+
+    def _checked_payload(self, *args, **kwargs) -> dict:
+        # formatted and validated against the market rules before anything is signed
+        payload = self._order_payload(*args, **kwargs)
+
+        if self.markets is not None:
+            self.markets.prepare(payload)
+
+        return payload
+
+    @staticmethod
+    def _order_payload(
+            symbol: str,
+            side: str,
+            order_type: str,
+            price: Optional[str] = None,
+            client_id: Optional[int] = None,
+            quantity: Optional[str] = None,
+            quote_quantity: Optional[str] = None,
+            post_only: Optional[bool] = None,
+            self_trade_prevention: Optional[str] = None,
+            time_in_force: Optional[str] = None,
+            trigger_price: Optional[str] = None
+    ) -> dict:
         match side.lower():
             case "buy":
                 side = "Bid"
@@ -312,11 +409,7 @@ class BackpackPrivate(BaseClient):
         }
 
         # remove None values
-        payload = {k: v for k, v in payload.items() if v is not None}
-
-        headers = self._sign_request('orderExecute', body=payload)
-
-        return await self.session.post(url, headers=headers, json=payload)
+        return {k: v for k, v in payload.items() if v is not None}
 
     async def cancel_open_order(self, symbol: str, client_id: int = None, order_id: str = None):
         """
@@ -330,19 +423,9 @@ class BackpackPrivate(BaseClient):
 
         url = self.API_URL + '/api/v1/order'
 
-        params = {
-            'symbol': symbol
-        }
-
-        if client_id:
-            params['clientId'] = client_id
-
-        if order_id:
-            params['orderId'] = order_id
-
-        headers = self._sign_request('orderCancel', body=params)
+        params = self._order_id_params(symbol, client_id, order_id)
 
-        return await self.session.delete(url, headers=headers, json=params)
+        return await self._request('DELETE', url, model=Order, instruction='orderCancel', json=params)
 
     async def get_open_orders(self, symbol: str):
         """
@@ -360,9 +443,7 @@ class BackpackPrivate(BaseClient):
             'symbol': symbol,
         }
 
-        headers = self._sign_request('orderQueryAll', body=params)
-
-        return await self.session.get(url, headers=headers, params=params)
+        return await self._request('GET', url, model=Order, instruction='orderQueryAll', params=params)
 
     async def cancel_all_orders(self, symbol: str):
         """
@@ -379,6 +460,131 @@ class BackpackPrivate(BaseClient):
             'symbol': symbol,
         }
 
-        headers = self._sign_request('orderCancelAll', body=params)
+        return await self._request('DELETE', url, model=Order, instruction='orderCancelAll', json=params)
+
+    async def iter_deposits(self, limit: int = 100, offset: int = 0, prefetch: int = 2):
+        """
+        Iterates over the whole deposit history, requesting up to ``prefetch`` pages ahead.
+
+        :return:
+        """
+
+        async for deposit in paginate(self.get_deposits, limit, offset, prefetch):
+            yield deposit
+
+    async def iter_withdrawals(self, limit: int = 100, offset: int = 0, prefetch: int = 2):
+        """
+        Iterates over the whole withdrawal history, requesting up to ``prefetch`` pages ahead.
+
+        :return:
+        """
+
+        async for withdrawal in paginate(self.get_withdrawals, limit, offset, prefetch):
+            yield withdrawal
+
+    async def iter_order_history(self, symbol: str, limit: int = 100, offset: int = 0, prefetch: int = 2):
+        """
+        Iterates over the whole order history of the symbol, requesting up to ``prefetch`` pages ahead.
+
+        :return:
+        """
+
+        async def fetch(page_limit: int, page_offset: int):
+            return await self.get_order_history(symbol, page_limit, page_offset)
+
+        async for order in paginate(fetch, limit, offset, prefetch):
+            yield order
+
+    async def iter_fill_history(self, order_id: str, symbol: str, limit: int = 100, offset: int = 0,
+                                prefetch: int = 2):
+        """
+        Iterates over all historical fills, requesting up to ``prefetch`` pages ahead.
+
+        :return:
+        """
+
+        async def fetch(page_limit: int, page_offset: int):
+            return await self.get_fill_history(order_id, symbol, page_limit, page_offset)
+
+        async for fill in paginate(fetch, limit, offset, prefetch, key='tradeId'):
+            yield fill
+
+    async def execute_orders(self, orders: List[dict], native: bool = True, max_in_flight: int = 10) -> list:
+        """
+        Submits several orders at once. Every order is a dict of ``execute_order`` arguments.
+
+        With ``native`` the exchange batch endpoint places them in a single request. Otherwise the
+        orders are sent concurrently over the pooled connections, at most ``max_in_flight`` at a time,
+        and each one is signed only when its turn comes.
+
+        https://docs.backpack.exchange/#tag/Order/operation/execute_order_batch
+
+        :return: the results of every order, in order (exceptions included when pipelined)
+        """
+
+        payloads = [self._checked_payload(**order) for order in orders]
+
+        if native:
+            url = self.API_URL + '/api/v1/orders'
+
+            return await self._request('POST', url, model=Order, instruction='orderExecute', json=payloads)
+
+        url = self.API_URL + '/api/v1/order'
+
+        return await self._pipeline('POST', url, 'orderExecute', payloads, max_in_flight)
+
+    async def cancel_orders(self, cancels: List[dict], max_in_flight: int = 10) -> list:
+        """
+        Cancels several open orders concurrently, at most ``max_in_flight`` at a time. Every cancel is a dict
+        of ``cancel_open_order`` arguments (``symbol`` and ``client_id`` or ``order_id``).
+
+        :return: the results of every cancel, in order (exceptions included)
+        """
+
+        url = self.API_URL + '/api/v1/order'
+        params = [self._order_id_params(**cancel) for cancel in cancels]
+
+        return await self._pipeline('DELETE', url, 'orderCancel', params, max_in_flight)
+
+    async def cancel_replace(self, cancels: List[dict], orders: List[dict], native: bool = True,
+                             max_in_flight: int = 10) -> Tuple[list, list]:
+        """
+        Cancels ``cancels`` and then places ``orders``, e.g. to re-quote a ladder.
+        New orders are only sent once every cancel has been answered.
+
+        :return: cancel results and order results, each in order
+        """
+
+        if self.markets is not None:
+            # invalid orders fail before anything is cancelled
+            for order in orders:
+                self._checked_payload(**order)
+
+        cancel_results = await self.cancel_orders(cancels, max_in_flight)
+        order_results = await self.execute_orders(orders, native, max_in_flight)
+
+        return cancel_results, order_results
+
+    async def _pipeline(self, method: str, url: str, instruction: str, bodies: List[dict], max_in_flight: int) -> list:
+        semaphore = asyncio.Semaphore(max_in_flight)
+
+        async def send(body: dict):
+            # signed in _send once the request holds a slot, so waiting in line cannot expire it
+            async with semaphore:
+                return await self._request(method, url, model=Order, instruction=instruction, json=body)
+
+        return await asyncio.gather(*(send(body) for body in bodies), return_exceptions=True)
+
+    @staticmethod
+    def _order_id_params(symbol: str, client_id: Optional[int] = None, order_id: Optional[str] = None) -> dict:
+        params = {
+            'symbol': symbol
+        }
+
+        if client_id:
+            params['clientId'] = client_id
+
+        if order_id:
+            params['orderId'] = order_id
 
-        return await self.session.delete(url, headers=headers, json=params)
+        return params
@@ -0,0 +1,197 @@
+import base64
+import re
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import quote_plus, urlencode
+
+_UNSAFE = re.compile(r'[^A-Za-z0-9_.\-~]')
+_SCALARS = (str, int, float)
+
+
+def _quote(value: str) -> str:
+    return quote_plus(value) if _UNSAFE.search(value) else value
+
+
+def encode_body(body: Optional[dict]) -> str:
+    """
+    Encodes the body in the canonical form expected by the exchange: keys sorted and url-encoded.
+
+    Flat payloads of strings, numbers and booleans take a fast path producing exactly
+    the same output as ``urlencode(sorted(body.items()))``.
+
+    :param body:
+    :return:
+    """
+
+    if not body:
+        return ''
+
+    parts = []
+
+    for key in sorted(body):
+        value = body[key]
+
+        if not isinstance(value, _SCALARS):
+            return urlencode(sorted(body.items()))
+
+        parts.append(_quote(key) + '=' + _quote(value if isinstance(value, str) else str(value)))
+
+    return '&'.join(parts)
+
+
+MAX_WINDOW = 60000
+
+
+class Signer:
+    """
+    Ed25519 request signer with state precomputed once per key: the public key header,
+    the header templates and the encoded prefix of every instruction seen so far.
+
+    ``windows`` overrides the receive window (milliseconds) of single instructions, e.g.
+    ``{'orderExecute': 500}``. Timestamps follow the server clock when a ``clock`` with an
+    ``offset`` in milliseconds (see ``ClockSync``) is attached.
+    """
+
+    def __init__(self, api_secret: str, window: int = 5000, windows: Optional[Dict[str, int]] = None, clock=None):
+        # cryptography is imported on first use, clients without a secret never load it
+        from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+        from cryptography.hazmat.primitives import serialization
+
+        self.private_key = Ed25519PrivateKey.from_private_bytes(base64.b64decode(api_secret))
+        self.verifying_key = self.private_key.public_key()
+        self.verifying_key_b64 = base64.b64encode(
+            self.verifying_key.public_bytes(
+                encoding=serialization.Encoding.Raw,
+                format=serialization.PublicFormat.Raw
+            )
+        ).decode()
+
+        self.window = str(self._check_window(window))
+        self.windows = {instruction: self._check_window(value) for instruction, value in (windows or {}).items()}
+        self.clock = clock
+
+        self._instructions: Dict[str, Tuple[bytes, Tuple[bytes, Dict[str, str]]]] = {}
+
+    @staticmethod
+    def _check_window(window: int) -> int:
+        if not 0 < window <= MAX_WINDOW:
+            raise ValueError(f'Invalid window: {window}. Must be between 1 and {MAX_WINDOW} ms')
+
+        return window
+
+    def set_window(self, instruction: str, window: int):
+        """
+        Sets the receive window of one instruction.
+
+        Args:
+            instruction (str): The instruction.
+            window (int): The window in milliseconds.
+        """
+
+        self.windows[instruction] = self._check_window(window)
+        self._instructions.pop(instruction, None)
+
+    def _instruction(self, instruction: str) -> Tuple[bytes, Tuple[bytes, Dict[str, str]]]:
+        cached = self._instructions.get(instruction)
+
+        if cached is None:
+            window = str(self.windows.get(instruction, self.window))
+            cached = self._instructions[instruction] = (
+                f'instruction={_quote(instruction)}'.encode(),
+                (
+                    f'&window={window}'.encode(),
+                    {'X-API-KEY': self.verifying_key_b64, 'X-WINDOW': window, 'Content-Type': 'application/json'},
+                ),
+            )
+
+        return cached
+
+    def timestamp(self) -> str:
+        if self.clock is None:
+            return str(int(time.time() * 1000))
+
+        return str(int(time.time() * 1000 + self.clock.offset))
+
+    def _sign(self, prefix: bytes, window: Tuple[bytes, Dict[str, str]], encoded_body: str,
+              timestamp: str) -> Dict[str, str]:
+        window_suffix, template = window
+        message = b''.join((
+            prefix,
+            b'&' + encoded_body.encode() if encoded_body else b'',
+            b'&timestamp=',
+            timestamp.encode(),
+            window_suffix
+        ))
+
+        headers = template.copy()
+        headers['X-TIMESTAMP'] = timestamp
+        headers['X-SIGNATURE'] = base64.b64encode(self.private_key.sign(message)).decode()
+
+        return headers
+
+    def sign(self, instruction: str, body: Optional[dict] = None) -> Dict[str, str]:
+        """
+        Signs a request with the given instruction and optional parameters.
+
+        Args:
+            instruction (str): The instruction for the request.
+            body (Optional[dict]): Optional parameters for the request.
+
+        Returns:
+            dict: The headers of the signed request.
+        """
+
+        prefix, window = self._instruction(instruction)
+
+        return self._sign(prefix, window, encode_body(body), self.timestamp())
+
+    def sign_encoded(self, instruction: str, encoded_body: str) -> Dict[str, str]:
+        """
+        Signs a request whose body is already in canonical form (see ``encode_body``).
+
+        Args:
+            instruction (str): The instruction for the request.
+            encoded_body (str): The canonically encoded parameters.
+
+        Returns:
+            dict: The headers of the signed request.
+        """
+
+        prefix, window = self._instruction(instruction)
+
+        return self._sign(prefix, window, encoded_body, self.timestamp())
+
+    def sign_batch(self, instruction: str, bodies: Iterable[Optional[dict]]) -> Dict[str, str]:
+        """
+        Signs the payloads of a batch endpoint as one request: every payload is prefixed
+        with the instruction and the parts are joined before the timestamp and window.
+
+        Args:
+            instruction (str): The instruction of every payload.
+            bodies (Iterable[Optional[dict]]): Payloads of the batch.
+
+        Returns:
+            dict: The headers of the signed request.
+        """
+
+        prefix, window = self._instruction(instruction)
+        parts = [prefix + (b'&' + encoded.encode() if encoded else b'') for encoded in map(encode_body, bodies)]
+
+        return self._sign(b'&'.join(parts), window, '', self.timestamp())
+
+    def sign_many(self, instruction: str, bodies: Iterable[Optional[dict]]) -> List[Dict[str, str]]:
+        """
+        Signs a batch of payloads sharing one instruction and one timestamp.
+
+        Args:
+            instruction (str): The instruction for every request.
+            bodies (Iterable[Optional[dict]]): Parameters of each request.
+
+        Returns:
+            list: The headers of each signed request, in order.
+        """
+
+        prefix, window = self._instruction(instruction)
+        timestamp = self.timestamp()
+
+        return [self._sign(prefix, window, encode_body(body), timestamp) for body in bodies]
@@ -0,0 +1,126 @@
+from typing import Dict, List, Optional, Tuple
+
+from backpack.base.models import Order
+from .signer import _quote
+
+# order fields that change between submissions of one template
+VARIABLE_FIELDS = ('clientId', 'price', 'quantity', 'quoteQuantity', 'triggerPrice')
+
+
+class OrderTemplate:
+    """
+    Order fields fixed once per (symbol, side, type, time in force, post only), normalized and
+    canonically encoded in advance.
+
+    Submitting only fills in the variable fields (``clientId``, ``price``, ``quantity``,
+    ``quoteQuantity``, ``triggerPrice``), encodes them between the precomputed segments and signs.
+    The result is identical to ``execute_order`` with the same arguments.
+
+    Create templates with ``BackpackPrivate.order_template``.
+    """
+
+    def __init__(self, client, symbol: str, side: str, order_type: str, time_in_force: Optional[str] = None,
+                 post_only: Optional[bool] = None, self_trade_prevention: Optional[str] = None):
+        self.client = client
+        self.fields = client._order_payload(
+            symbol, side, order_type, post_only=post_only, self_trade_prevention=self_trade_prevention,
+            time_in_force=time_in_force
+        )
+        self.url = client.API_URL + '/api/v1/order'
+
+        # canonical (sorted) order of the body: runs of fixed fields are joined into one literal segment
+        self._layout: List[Tuple[Optional[str], Optional[str]]] = []
+        literals: List[str] = []
+
+        for key in sorted({*self.fields, *VARIABLE_FIELDS}):
+            if key in VARIABLE_FIELDS:
+                if literals:
+                    self._layout.append((None, '&'.join(literals)))
+                    literals = []
+
+                self._layout.append((key, None))
+            else:
+                value = self.fields[key]
+                literals.append(_quote(key) + '=' + _quote(value if isinstance(value, str) else str(value)))
+
+        if literals:
+            self._layout.append((None, '&'.join(literals)))
+
+    def encode(self, values: Dict[str, object]) -> str:
+        """
+        Canonical encoding of the order with the given variable fields, equal to ``encode_body``
+        of the full payload.
+        """
+
+        parts = []
+
+        for key, literal in self._layout:
+            if literal is not None:
+                parts.append(literal)
+            else:
+                value = values.get(key)
+
+                if value is not None:
+                    parts.append(key + '=' + _quote(value if isinstance(value, str) else str(value)))
+
+        return '&'.join(parts)
+
+    def _payload(self, price: Optional[str], quantity: Optional[str], client_id: Optional[int],
+                 quote_quantity: Optional[str], trigger_price: Optional[str]) -> dict:
+        payload = self.fields.copy()
+
+        for key, value in (
+                ('clientId', client_id),
+                ('price', price),
+                ('quantity', quantity),
+                ('quoteQuantity', quote_quantity),
+                ('triggerPrice', trigger_price),
+        ):
+            if value is not None:
+                payload[key] = value
+
+        if self.client.markets is not None:
+            self.client.markets.prepare(payload)
+
+        return payload
+
+    def build(self, price: Optional[str] = None, quantity: Optional[str] = None, client_id: Optional[int] = None,
+              quote_quantity: Optional[str] = None, trigger_price: Optional[str] = None) -> Tuple[dict, dict]:
+        """
+        Builds and signs an order without sending it.
+
+        :return: the payload and the signed headers
+        """
+
+        payload = self._payload(price, quantity, client_id, quote_quantity, trigger_price)
+
+        return payload, self.client.signer.sign_encoded('orderExecute', self.encode(payload))
+
+    async def submit(self, price: Optional[str] = None, quantity: Optional[str] = None, client_id: Optional[int] = None,
+                     quote_quantity: Optional[str] = None, trigger_price: Optional[str] = None):
+        """
+        Submits an order from the template. The encoded body is signed in ``_send`` right before
+        every attempt, like any other private request.
+
+        With a ``retry_policy`` on the client the order goes through ``execute_order`` instead,
+        which recovers ambiguous failures by ``clientId``.
+
+        https://docs.backpack.exchange/#tag/Order/operation/execute_order
+
+        :return:
+        """
+
+        client = self.client
+
+        if client.retry_policy is not None:
+            return await client.execute_order(
+                self.fields['symbol'], 'buy' if self.fields['side'] == 'Bid' else 'sell', self.fields['orderType'],
+                price, client_id, quantity, quote_quantity, self.fields.get('postOnly'),
+                self.fields.get('selfTradePrevention'), self.fields.get('timeInForce'), trigger_price
+            )
+
+        payload = self._payload(price, quantity, client_id, quote_quantity, trigger_price)
+
+        return await client._request(
+            'POST', self.url, model=Order, instruction='orderExecute', encoded_body=self.encode(payload), json=payload
+        )
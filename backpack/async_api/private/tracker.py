@@ -0,0 +1,279 @@
+import asyncio
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import aiohttp
+
+from backpack.base.decoder import read_json
+from backpack.base.models import BackpackError
+
+OPEN_STATUSES = frozenset(('New', 'PartiallyFilled', 'TriggerPending'))
+
+# order update stream fields and their REST names
+_EVENT_FIELDS = {
+    'i': 'id',
+    'c': 'clientId',
+    's': 'symbol',
+    'S': 'side',
+    'o': 'orderType',
+    'f': 'timeInForce',
+    'p': 'price',
+    'P': 'triggerPrice',
+    'q': 'quantity',
+    'Q': 'quoteQuantity',
+    'z': 'executedQuantity',
+    'Z': 'executedQuoteQuantity',
+    'X': 'status',
+}
+
+_ZERO = Decimal(0)
+
+
+def _decimal(value) -> Decimal:
+    return _ZERO if value is None else Decimal(value)
+
+
+class OrderTracker:
+    """
+    In-memory view of open orders, fills and balances of one account.
+
+    State is updated optimistically from order placement and cancel responses and from the
+    private order update stream, and reconciled periodically against REST snapshots.
+    Every read is a dictionary lookup, no network call is made.
+
+    Funds of open limit orders are moved from ``available`` to ``locked`` balances as orders
+    are accepted and released as they are filled or cancelled.
+    """
+
+    def __init__(self, client, symbols: Iterable[str] = ()):
+        self.client = client
+        self.symbols = set(symbols)
+
+        self.open_orders: Dict[str, dict] = {}
+        self.fills: Dict[str, List[dict]] = {}
+        self.balances: Dict[str, Dict[str, Decimal]] = {}
+
+        self._by_client_id: Dict[int, str] = {}
+        self._locks: Dict[str, Tuple[str, Decimal]] = {}
+        self._tasks: List[asyncio.Task] = []
+
+    def get_order(self, order_id: Optional[str] = None, client_id: Optional[int] = None) -> Optional[dict]:
+        if order_id is None:
+            order_id = self._by_client_id.get(client_id)
+
+        return self.open_orders.get(order_id)
+
+    def get_balance(self, asset: str) -> Dict[str, Decimal]:
+        return self.balances.get(asset) or {'available': _ZERO, 'locked': _ZERO}
+
+    def _balance(self, asset: str) -> Dict[str, Decimal]:
+        return self.balances.setdefault(asset, {'available': _ZERO, 'locked': _ZERO})
+
+    @staticmethod
+    def _assets(symbol: str) -> Tuple[str, str]:
+        base, _, quote = symbol.partition('_')
+
+        return base, quote
+
+    def _lock(self, order: dict):
+        """
+        Moves funds between available and locked so that the lock of the order
+        matches its remaining quantity.
+        """
+
+        base, quote = self._assets(order['symbol'])
+        remaining = _decimal(order.get('quantity')) - _decimal(order.get('executedQuantity'))
+        price = order.get('price')
+
+        if order.get('status') not in OPEN_STATUSES or remaining <= 0:
+            asset, amount = base if order.get('side') == 'Ask' else quote, _ZERO
+        elif order.get('side') == 'Bid':
+            if price is None:
+                return
+            asset, amount = quote, remaining * Decimal(price)
+        else:
+            asset, amount = base, remaining
+
+        previous_asset, previous = self._locks.get(order['id'], (asset, _ZERO))
+        delta = amount - previous
+
+        if delta:
+            balance = self._balance(previous_asset)
+            balance['available'] -= delta
+            balance['locked'] += delta
+
+        if amount:
+            self._locks[order['id']] = (asset, amount)
+        else:
+            self._locks.pop(order['id'], None)
+
+    def on_order(self, order: dict):
+        """
+        Applies the state of an order in REST format.
+
+        :param order:
+        :return:
+        """
+
+        order_id = order.get('id')
+
+        if order_id is None:
+            return
+
+        tracked = self.open_orders.get(order_id)
+
+        if tracked is None:
+            tracked = dict(order)
+        else:
+            tracked.update((key, value) for key, value in order.items() if value is not None)
+
+        self.symbols.add(tracked['symbol'])
+        self._lock(tracked)
+
+        client_id = tracked.get('clientId')
+
+        if tracked.get('status') in OPEN_STATUSES:
+            self.open_orders[order_id] = tracked
+
+            if client_id is not None:
+                self._by_client_id[client_id] = order_id
+        else:
+            self.open_orders.pop(order_id, None)
+
+            if client_id is not None and self._by_client_id.get(client_id) == order_id:
+                del self._by_client_id[client_id]
+
+    def on_order_update(self, event: dict):
+        """
+        Applies an event of the ``account.orderUpdate`` stream.
+
+        :param event:
+        :return:
+        """
+
+        order = {name: event[key] for key, name in _EVENT_FIELDS.items() if key in event}
+
+        if event.get('e') == 'orderFill':
+            self._on_fill(event)
+
+        self.on_order(order)
+
+    def _on_fill(self, event: dict):
+        fills = self.fills.setdefault(event['i'], [])
+        trade_id = event.get('t')
+
+        if trade_id is not None and any(fill['tradeId'] == trade_id for fill in fills):
+            return
+
+        quantity, price = Decimal(event['l']), Decimal(event['L'])
+        fills.append({
+            'tradeId': trade_id,
+            'orderId': event['i'],
+            'symbol': event['s'],
+            'side': event['S'],
+            'price': event['L'],
+            'quantity': event['l'],
+            'fee': event.get('n'),
+            'feeSymbol': event.get('N'),
+            'isMaker': event.get('m'),
+            'timestamp': event.get('T'),
+        })
+
+        base, quote = self._assets(event['s'])
+        sign = 1 if event['S'] == 'Bid' else -1
+        self._balance(base)['available'] += sign * quantity
+        self._balance(quote)['available'] -= sign * quantity * price
+
+        if event.get('N') is not None:
+            self._balance(event['N'])['available'] -= _decimal(event.get('n'))
+
+    async def execute_order(self, **kwargs):
+        """
+        Places an order through the client and tracks it from the response.
+
+        :return: the client response
+        """
+
+        response = await self.client.execute_order(**kwargs)
+        self.on_order(await read_json(response))
+
+        return response
+
+    async def cancel_open_order(self, symbol: str, client_id: Optional[int] = None, order_id: Optional[str] = None):
+        """
+        Cancels an order through the client and tracks it from the response.
+
+        :return: the client response
+        """
+
+        response = await self.client.cancel_open_order(symbol, client_id=client_id, order_id=order_id)
+        self.on_order(await read_json(response))
+
+        return response
+
+    async def reconcile(self):
+        """
+        Replaces the local state with the open orders and balances reported by the exchange.
+
+        :return:
+        """
+
+        balances, *orders = await asyncio.gather(
+            self.client.get_balances(),
+            *(self.client.get_open_orders(symbol) for symbol in self.symbols)
+        )
+
+        self.open_orders.clear()
+        self._by_client_id.clear()
+        self._locks.clear()
+
+        self.balances = {
+            asset: {'available': _decimal(balance.get('available')), 'locked': _decimal(balance.get('locked'))}
+            for asset, balance in (await read_json(balances)).items()
+        }
+
+        for snapshot in orders:
+            for order in await read_json(snapshot):
+                self.on_order(order)
+
+        # locked balances of the snapshot already include open orders
+        for asset, amount in self._locks.values():
+            balance = self._balance(asset)
+            balance['available'] += amount
+            balance['locked'] -= amount
+
+    async def _consume(self, websocket):
+        stream = await websocket.order_updates()
+
+        async for event in stream:
+            self.on_order_update(event)
+
+    async def _reconcile_periodically(self, interval: float):
+        while True:
+            try:
+                await self.reconcile()
+            except (aiohttp.ClientError, asyncio.TimeoutError, BackpackError):
+                pass
+
+            await asyncio.sleep(interval)
+
+    def start(self, websocket=None, reconcile_interval: float = 30):
+        """
+        Starts following the order update stream of ``websocket`` (if given) and
+        reconciling every ``reconcile_interval`` seconds.
+
+        :return:
+        """
+
+        if websocket is not None:
+            self._tasks.append(asyncio.create_task(self._consume(websocket)))
+
+        self._tasks.append(asyncio.create_task(self._reconcile_periodically(reconcile_interval)))
+
+    async def close(self):
+        for task in self._tasks:
+            task.cancel()
+
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+
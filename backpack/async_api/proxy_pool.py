@@ -0,0 +1,183 @@
+import asyncio
+import time
+from typing import Iterable, List, Optional
+
+import aiohttp
+
+from backpack.base.models import BaseClient
+from .connection import ConnectionStats, PoolSettings, create_session
+
+
+class ProxyState:
+    __slots__ = (
+        'url', 'stats', 'latency', 'failures', 'healthy', 'ejected_until', 'requests',
+        '_pool', '_trace_configs', '_session'
+    )
+
+    def __init__(self, url: str, stats: ConnectionStats, pool: PoolSettings,
+                 trace_configs: List[aiohttp.TraceConfig]):
+        self.url = url
+        self.stats = stats
+        self.latency: Optional[float] = None
+        self.failures = 0
+        self.healthy = True
+        self.ejected_until = 0.0
+        self.requests = 0
+
+        self._pool = pool
+        self._trace_configs = trace_configs
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        # created on first use: sessions need a running event loop, the pool may be built outside one
+        if self._session is None:
+            self._session = create_session(self.url, self._pool, [self.stats.trace_config(), *self._trace_configs])
+
+        return self._session
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def as_dict(self) -> dict:
+        return {
+            'healthy': self.healthy,
+            'latency': self.latency,
+            'failures': self.failures,
+            'requests': self.requests,
+            'connections': self.stats.as_dict(),
+        }
+
+
+class ProxyPool:
+    """
+    Routes requests through the fastest healthy proxy of a list.
+
+    Every proxy has its own connector. Latency is tracked as an exponentially weighted average of
+    request and health-check round trips. A proxy failing ``max_failures`` times in a row is ejected
+    for at least ``eject_time`` seconds and re-admitted once a health check (a ping of the exchange)
+    succeeds again. If no proxy is healthy, the one ejected first is used.
+    """
+
+    def __init__(
+            self,
+            proxies: Iterable[str],
+            pool: Optional[PoolSettings] = None,
+            health_interval: float = 10,
+            health_timeout: float = 5,
+            max_failures: int = 3,
+            eject_time: float = 30,
+            smoothing: float = 0.3,
+            ping_url: Optional[str] = None,
+            trace_configs: Optional[List[aiohttp.TraceConfig]] = None
+    ):
+        self.pool = pool or PoolSettings()
+        self.health_interval = health_interval
+        self.health_timeout = health_timeout
+        self.max_failures = max_failures
+        self.eject_time = eject_time
+        self.smoothing = smoothing
+        self.ping_url = ping_url or BaseClient.API_URL + '/api/v1/ping'
+        self.trace_configs = list(trace_configs or [])
+
+        self.proxies: List[ProxyState] = [self._create(url) for url in proxies]
+
+        if not self.proxies:
+            raise ValueError('At least one proxy must be provided')
+
+        self._task: Optional[asyncio.Task] = None
+
+    def _create(self, url: str) -> ProxyState:
+        return ProxyState(url, ConnectionStats(), self.pool, self.trace_configs)
+
+    def pick(self) -> ProxyState:
+        healthy = [proxy for proxy in self.proxies if proxy.healthy]
+
+        if not healthy:
+            return min(self.proxies, key=lambda proxy: proxy.ejected_until)
+
+        # proxies without measurements yet are tried first
+        return min(healthy, key=lambda proxy: proxy.latency or 0.0)
+
+    def _succeeded(self, proxy: ProxyState, latency: float):
+        proxy.failures = 0
+        proxy.latency = latency if proxy.latency is None else (
+            self.smoothing * latency + (1 - self.smoothing) * proxy.latency
+        )
+
+        if not proxy.healthy and time.monotonic() >= proxy.ejected_until:
+            proxy.healthy = True
+
+    def _failed(self, proxy: ProxyState):
+        proxy.failures += 1
+
+        if proxy.failures >= self.max_failures:
+            if proxy.healthy:
+                proxy.ejected_until = time.monotonic() + self.eject_time
+
+            proxy.healthy = False
+
+    async def request(self, method: str, url: str, **kwargs):
+        proxy = self.pick()
+        proxy.requests += 1
+        start = time.perf_counter()
+
+        try:
+            response = await proxy.session.request(method, url, **kwargs)
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            self._failed(proxy)
+            raise
+
+        self._succeeded(proxy, time.perf_counter() - start)
+
+        return response
+
+    async def check(self, proxy: ProxyState):
+        start = time.perf_counter()
+
+        try:
+            timeout = aiohttp.ClientTimeout(total=self.health_timeout)
+
+            async with proxy.session.get(self.ping_url, timeout=timeout) as response:
+                await response.read()
+                ok = response.status < 500
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            ok = False
+
+        if ok:
+            self._succeeded(proxy, time.perf_counter() - start)
+        else:
+            self._failed(proxy)
+
+    async def check_all(self):
+        await asyncio.gather(*(self.check(proxy) for proxy in self.proxies))
+
+    async def _health_loop(self):
+        while True:
+            await self.check_all()
+            await asyncio.sleep(self.health_interval)
+
+    def start(self) -> asyncio.Task:
+        """
+        Starts periodic health checks of every proxy.
+
+        :return:
+        """
+
+        if self._task is None:
+            self._task = asyncio.create_task(self._health_loop())
+
+        return self._task
+
+    def stats(self) -> dict:
+        return {proxy.url: proxy.as_dict() for proxy in self.proxies}
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+        for proxy in self.proxies:
+            await proxy.close()
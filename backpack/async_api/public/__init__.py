@@ -1,6 +1,12 @@
 from .public import BackpackPublic
+from .cache import ResponseCache
+from .klines import KLineDownloader
+from .snapshot import MarketSnapshot
 
 
 __all__ = [
-    'BackpackPublic'
+    'BackpackPublic',
+    'ResponseCache',
+    'KLineDownloader',
+    'MarketSnapshot'
 ]
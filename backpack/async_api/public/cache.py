@@ -0,0 +1,135 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Optional
+from urllib.parse import urlsplit
+
+# seconds a response stays fresh, by endpoint path
+DEFAULT_TTLS = {
+    '/api/v1/assets': 300,
+    '/api/v1/markets': 300,
+    '/api/v1/status': 5,
+    '/api/v1/ticker': 1,
+    '/api/v1/tickers': 1,
+}
+
+
+class _LeaderCancelled(Exception):
+    pass
+
+
+class ResponseCache:
+    """
+    TTL/LRU cache with single-flight coalescing for public GET endpoints.
+
+    Concurrent identical requests share one in-flight request, and its response is kept for the
+    TTL of the endpoint. Bodies are read before a response is shared, so every caller can
+    ``await response.json()`` on the same response object. Only endpoints listed in ``ttls``
+    are cached and at most ``max_entries`` responses are kept.
+    """
+
+    def __init__(self, ttls: Optional[Dict[str, float]] = None, max_entries: int = 1024):
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.max_entries = max_entries
+
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+        self._entries = OrderedDict()
+        self._inflight: Dict[tuple, asyncio.Future] = {}
+
+    def ttl(self, url: str) -> Optional[float]:
+        return self.ttls.get(urlsplit(url).path)
+
+    async def fetch(self, url: str, params: Optional[dict], ttl: float, send: Callable[[], Awaitable]):
+        """
+        Returns the cached response for ``url`` and ``params``, joining an identical request in flight
+        or calling ``send`` if there is none.
+
+        :param url:
+        :param params:
+        :param ttl:
+        :param send:
+        :return:
+        """
+
+        key = (url, tuple(sorted(params.items())) if params else ())
+
+        while True:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+
+                del self._entries[key]
+
+            future = self._inflight.get(key)
+            if future is None:
+                break
+
+            self.coalesced += 1
+
+            try:
+                return await asyncio.shield(future)
+            except _LeaderCancelled:
+                # the first waiter to get here sends the request again
+                continue
+
+        self.misses += 1
+        future = self._inflight[key] = asyncio.get_running_loop().create_future()
+
+        try:
+            response = await send()
+            await response.read()
+        except asyncio.CancelledError:
+            # waiters get a plain exception and take over, cancelling them would look like their own cancellation
+            future.set_exception(_LeaderCancelled())
+            future.exception()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # mark as retrieved in case nobody else was waiting
+            future.exception()
+            raise
+        else:
+            future.set_result(response)
+
+            if response.status < 400:
+                self._store(key, time.monotonic() + ttl, response)
+        finally:
+            del self._inflight[key]
+
+        return response
+
+    def _store(self, key: tuple, expires: float, response):
+        self._entries[key] = (expires, response)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, path: Optional[str] = None):
+        """
+        Drops cached responses of the given endpoint path, or all of them.
+
+        :param path: e.g. ``/api/v1/markets``
+        :return:
+        """
+
+        if path is None:
+            self._entries.clear()
+            return
+
+        for key in [key for key in self._entries if urlsplit(key[0]).path == path]:
+            del self._entries[key]
+
+    def stats(self) -> dict:
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'coalesced': self.coalesced,
+            'entries': len(self._entries),
+        }
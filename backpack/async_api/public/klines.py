@@ -0,0 +1,69 @@
+import asyncio
+from typing import Dict, Optional, Union
+
+from backpack.base.decoder import read_json
+from backpack.base.models import Interval
+
+
+class KLineDownloader:
+    """
+    Downloads long k-line histories by splitting the time range into chunks of at most
+    ``chunk_size`` candles, fetched concurrently (and through the client's rate limiter, if any).
+
+    Candles are returned as columnar NumPy arrays sorted by start time and de-duplicated.
+    """
+
+    def __init__(self, client, chunk_size: int = 1000, concurrency: int = 4):
+        self.client = client
+        self.chunk_size = chunk_size
+        self.concurrency = concurrency
+
+    def chunks(self, interval: Interval, start_time: int, end_time: int):
+        span = self.chunk_size * interval.seconds
+
+        return [(start, min(start + span, end_time)) for start in range(start_time, end_time, span)]
+
+    async def download(
+            self,
+            symbol: str,
+            interval: Union[Interval, str],
+            start_time: int,
+            end_time: int,
+            resume_from: Optional[Dict] = None
+    ) -> Dict:
+        """
+        Downloads candles between ``start_time`` and ``end_time`` (epoch seconds).
+
+        If ``resume_from`` holds previously downloaded columns, only candles after the last
+        stored one are requested and the result contains both.
+
+        :param symbol:
+        :param interval:
+        :param start_time:
+        :param end_time:
+        :param resume_from:
+        :return: dict of ``timestamp``, ``open``, ``high``, ``low``, ``close`` and ``volume`` arrays
+        """
+
+        from backpack.base.arrays import klines_to_columns, merge_klines, require_numpy
+
+        require_numpy()
+
+        interval = Interval(interval)
+
+        if resume_from is not None and len(resume_from['timestamp']):
+            start_time = max(start_time, int(resume_from['timestamp'][-1]) + interval.seconds)
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def fetch(chunk_start: int, chunk_end: int):
+            async with semaphore:
+                response = await self.client.get_k_lines(symbol, interval.value, chunk_start, chunk_end)
+                return klines_to_columns(await read_json(response))
+
+        chunks = await asyncio.gather(*(fetch(*chunk) for chunk in self.chunks(interval, start_time, end_time)))
+
+        if resume_from is not None:
+            return merge_klines(resume_from, *chunks)
+
+        return merge_klines(*chunks)
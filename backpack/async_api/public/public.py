@@ -1,4 +1,8 @@
-from backpack.base.models import BaseClient, Interval
+from typing import Iterable, Optional
+
+from backpack.base.models import BaseClient, Interval, Depth, KLine, Ticker, Trade
+from ..paginator import paginate
+from .snapshot import MarketSnapshot, fetch_snapshot
 
 
 class BackpackPublic(BaseClient):
@@ -16,7 +20,7 @@ class BackpackPublic(BaseClient):
 
         url = self.API_URL + '/api/v1/assets'
 
-        return await self.session.get(url)
+        return await self._request('GET', url)
 
     async def get_markets(self):
         """
@@ -29,7 +33,7 @@ class BackpackPublic(BaseClient):
 
         url = self.API_URL + '/api/v1/markets'
 
-        return await self.session.get(url)
+        return await self._request('GET', url)
 
     async def get_ticker(self, symbol: str):
         """
@@ -47,7 +51,7 @@ class BackpackPublic(BaseClient):
             'symbol': symbol
         }
 
-        return await self.session.get(url, params=params)
+        return await self._request('GET', url, model=Ticker, params=params)
 
     async def get_tickers(self):
         """
@@ -60,7 +64,7 @@ class BackpackPublic(BaseClient):
 
         url = self.API_URL + '/api/v1/tickers'
 
-        return await self.session.get(url)
+        return await self._request('GET', url, model=Ticker)
 
     async def get_order_book_depth(self, symbol: str):
         """
@@ -77,7 +81,27 @@ class BackpackPublic(BaseClient):
             'symbol': symbol
         }
 
-        return await self.session.get(url, params=params)
+        return await self._request('GET', url, model=Depth, params=params)
+
+    async def get_market_snapshot(
+            self,
+            symbols: Optional[Iterable[str]] = None,
+            depth: bool = True,
+            levels: int = 10,
+            concurrency: int = 16
+    ) -> MarketSnapshot:
+        """
+        Fetches tickers of many markets in a single call and, optionally, their order book depth
+        with at most ``concurrency`` requests in flight.
+
+        :param symbols: markets to include, all markets by default
+        :param depth: whether to fetch the order book of every market
+        :param levels: number of book levels summed into ``bid_depth`` and ``ask_depth``
+        :param concurrency:
+        :return: columnar ``MarketSnapshot`` keyed by symbol, with latency stats of the fan-out
+        """
+
+        return await fetch_snapshot(self, symbols, depth, levels, concurrency)
 
     async def get_k_lines(self, symbol: str, interval: str, start_time: int, end_time: int):
         """
@@ -103,7 +127,7 @@ class BackpackPublic(BaseClient):
             'endTime': end_time
         }
 
-        return await self.session.get(url, params=params)
+        return await self._request('GET', url, model=KLine, params=params)
 
     async def get_status(self):
         """
@@ -116,7 +140,7 @@ class BackpackPublic(BaseClient):
 
         url = self.API_URL + '/api/v1/status'
 
-        return await self.session.get(url)
+        return await self._request('GET', url)
 
     async def send_ping(self):
         """
@@ -129,7 +153,7 @@ class BackpackPublic(BaseClient):
 
         url = self.API_URL + '/api/v1/ping'
 
-        return await self.session.get(url)
+        return await self._request('GET', url)
 
     async def get_system_time(self):
         """
@@ -142,7 +166,7 @@ class BackpackPublic(BaseClient):
 
         url = self.API_URL + '/api/v1/time'
 
-        return await self.session.get(url)
+        return await self._request('GET', url)
 
     async def get_recent_trades(self, symbol: str, limit: int = 100):
         """
@@ -164,7 +188,7 @@ class BackpackPublic(BaseClient):
             'limit': limit
         }
 
-        return await self.session.get(url, params=params)
+        return await self._request('GET', url, model=Trade, params=params)
 
     async def get_historical_trades(self, symbol: str, limit: int = 100, offset: int = 0):
         """
@@ -184,7 +208,22 @@ class BackpackPublic(BaseClient):
             'offset': offset
         }
 
-        return await self.session.get(url, params=params)
+        return await self._request('GET', url, model=Trade, params=params)
+
+    async def iter_historical_trades(self, symbol: str, limit: int = 100, offset: int = 0, prefetch: int = 2):
+        """
+        Iterates over all historical trades for the given symbol, newest first,
+        requesting up to ``prefetch`` pages ahead.
+
+        :param symbol:
+        :param limit: page size
+        :param offset:
+        :param prefetch:
+        :return:
+        """
+
+        async def fetch(page_limit: int, page_offset: int):
+            return await self.get_historical_trades(symbol, page_limit, page_offset)
 
-    async def close(self):
-        await self.session.close()
+        async for trade in paginate(fetch, limit, offset, prefetch):
+            yield trade
@@ -0,0 +1,150 @@
+import asyncio
+import math
+import time
+from typing import Dict, Iterable, List, Optional
+
+from backpack.base.decoder import read_json
+
+TICKER_COLUMNS = {
+    'last_price': 'lastPrice',
+    'first_price': 'firstPrice',
+    'high': 'high',
+    'low': 'low',
+    'price_change_percent': 'priceChangePercent',
+    'volume': 'volume',
+    'quote_volume': 'quoteVolume',
+}
+DEPTH_COLUMNS = ('bid_price', 'bid_size', 'ask_price', 'ask_size', 'bid_depth', 'ask_depth')
+
+NAN = float('nan')
+
+
+def _float(value) -> float:
+    return NAN if value is None else float(value)
+
+
+def _latency_stats(samples: List[float]) -> dict:
+    if not samples:
+        return {'count': 0}
+
+    samples = sorted(samples)
+    last = len(samples) - 1
+
+    return {
+        'count': len(samples),
+        'p50_ms': samples[last // 2] * 1e3,
+        'p99_ms': samples[min(int(len(samples) * 0.99), last)] * 1e3,
+        'max_ms': samples[last] * 1e3,
+    }
+
+
+class MarketSnapshot:
+    """
+    Columnar snapshot of many markets: one list per field, aligned with ``symbols``.
+
+    Ticker columns: ``last_price``, ``first_price``, ``high``, ``low``, ``price_change_percent``,
+    ``volume`` and ``quote_volume``. With depth: ``bid_price``, ``bid_size``, ``ask_price``,
+    ``ask_size`` and ``bid_depth`` / ``ask_depth`` (size of the top levels). Missing values are NaN;
+    failed depth requests are kept in ``errors``.
+    """
+
+    def __init__(self, symbols: List[str], columns: Dict[str, List[float]], errors: Dict[str, Exception],
+                 stats: dict):
+        self.symbols = symbols
+        self.index = {symbol: i for i, symbol in enumerate(symbols)}
+        self.columns = columns
+        self.errors = errors
+        self.stats = stats
+
+    def __len__(self):
+        return len(self.symbols)
+
+    def __contains__(self, symbol: str):
+        return symbol in self.index
+
+    def __getitem__(self, symbol: str) -> dict:
+        """
+        Row of one symbol as a dict of field values.
+        """
+
+        i = self.index[symbol]
+
+        return {name: column[i] for name, column in self.columns.items()}
+
+    def column(self, name: str) -> List[float]:
+        return self.columns[name]
+
+    def arrays(self) -> dict:
+        """
+        The columns as NumPy float arrays.
+        """
+
+        from backpack.base.arrays import require_numpy
+
+        np = require_numpy()
+
+        return {name: np.asarray(column, dtype=np.float64) for name, column in self.columns.items()}
+
+
+async def fetch_snapshot(client, symbols: Optional[Iterable[str]] = None, depth: bool = True, levels: int = 10,
+                         concurrency: int = 16) -> MarketSnapshot:
+    """
+    See ``BackpackPublic.get_market_snapshot``.
+    """
+
+    start = time.perf_counter()
+    tickers = await read_json(await client.get_tickers())
+    tickers_latency = time.perf_counter() - start
+
+    by_symbol = {ticker['symbol']: ticker for ticker in tickers}
+    symbols = list(by_symbol if symbols is None else symbols)
+
+    columns = {}
+
+    for name, key in TICKER_COLUMNS.items():
+        columns[name] = [_float(by_symbol[symbol].get(key)) if symbol in by_symbol else NAN for symbol in symbols]
+
+    errors: Dict[str, Exception] = {}
+    latencies: List[float] = []
+
+    if depth:
+        for name in DEPTH_COLUMNS:
+            columns[name] = [NAN] * len(symbols)
+
+        # a fixed number of workers share the symbols instead of one coroutine per symbol
+        pending = iter(enumerate(symbols))
+
+        async def worker():
+            for i, symbol in pending:
+                request_start = time.perf_counter()
+
+                try:
+                    book = await read_json(await client.get_order_book_depth(symbol))
+                except Exception as e:
+                    errors[symbol] = e
+                    continue
+
+                latencies.append(time.perf_counter() - request_start)
+
+                # bids are sorted ascending, so the best bid is the last one
+                bids, asks = book['bids'], book['asks']
+
+                if bids:
+                    columns['bid_price'][i], columns['bid_size'][i] = float(bids[-1][0]), float(bids[-1][1])
+                    columns['bid_depth'][i] = math.fsum(float(size) for _, size in bids[-levels:])
+
+                if asks:
+                    columns['ask_price'][i], columns['ask_size'][i] = float(asks[0][0]), float(asks[0][1])
+                    columns['ask_depth'][i] = math.fsum(float(size) for _, size in asks[:levels])
+
+        await asyncio.gather(*(worker() for _ in range(min(concurrency, len(symbols)))))
+
+    stats = {
+        'symbols': len(symbols),
+        'tickers_ms': tickers_latency * 1e3,
+        'depth': _latency_stats(latencies),
+        'errors': len(errors),
+        'total_ms': (time.perf_counter() - start) * 1e3,
+    }
+
+    return MarketSnapshot(symbols, columns, errors, stats)
@@ -0,0 +1,228 @@
+import asyncio
+import heapq
+import itertools
+import time
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+# endpoint classes in priority order: lower value is served first
+CANCEL = 'cancel'
+ORDER = 'order'
+PRIVATE = 'private'
+PUBLIC = 'public'
+
+PRIORITIES = {
+    CANCEL: 0,
+    ORDER: 1,
+    PRIVATE: 2,
+    PUBLIC: 3,
+}
+
+# (requests per second, burst) for each endpoint class
+DEFAULT_BUDGETS = {
+    CANCEL: (20, 40),
+    ORDER: (20, 40),
+    PRIVATE: (10, 20),
+    PUBLIC: (10, 20),
+}
+
+_ORDER_PATHS = ('/api/v1/order', '/api/v1/orders')
+
+
+class TokenBucket:
+    """
+    Token bucket whose waiters are served by priority, then in arrival order.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity or rate
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+
+        self._waiters = []
+        self._counter = itertools.count()
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def _try_take(self) -> bool:
+        now = time.monotonic()
+
+        if now < self.paused_until:
+            return False
+
+        self._refill(now)
+
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+
+        return False
+
+    async def acquire(self, priority: int = 0):
+        if not self._waiters and self._try_take():
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._counter), future))
+        self._schedule()
+
+        await future
+
+    def pause(self, seconds: float):
+        """
+        Stops granting tokens for ``seconds`` and empties the bucket. Tokens only accrue again
+        once the pause is over, so it does not end in a burst.
+        """
+
+        now = time.monotonic()
+        self.paused_until = max(self.paused_until, now + seconds)
+        self.tokens = 0
+        self.updated = self.paused_until
+
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        self._schedule()
+
+    def _schedule(self):
+        if self._timer is not None or not self._waiters:
+            return
+
+        now = time.monotonic()
+        delay = max(self.paused_until - now, (1 - self.tokens) / self.rate, 0)
+        self._timer = asyncio.get_running_loop().call_later(delay, self._release)
+
+    def _release(self):
+        self._timer = None
+        waiters = self._waiters
+
+        while waiters:
+            if waiters[0][2].done():
+                # cancelled while waiting
+                heapq.heappop(waiters)
+                continue
+
+            if not self._try_take():
+                break
+
+            heapq.heappop(waiters)[2].set_result(None)
+
+        self._schedule()
+
+
+class LaneMetrics:
+    __slots__ = ('requests', 'queued', 'total_wait', 'max_wait', 'throttled')
+
+    def __init__(self):
+        self.requests = 0
+        self.queued = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.throttled = 0
+
+    def as_dict(self) -> dict:
+        return {
+            'requests': self.requests,
+            'queued': self.queued,
+            'avg_wait': self.total_wait / self.requests if self.requests else 0.0,
+            'max_wait': self.max_wait,
+            'throttled': self.throttled,
+        }
+
+
+class RateLimiter:
+    """
+    Client-side request scheduler.
+
+    Every endpoint class (cancels, order placement, other private calls and public market data)
+    has its own token bucket, and all of them share a global bucket in which cancels and
+    orders always jump ahead of reads. A 429 response pauses the global bucket for the
+    ``Retry-After`` period (or an exponential backoff) before the request is retried.
+    """
+
+    def __init__(
+            self,
+            rate: float = 30,
+            burst: Optional[float] = None,
+            budgets: Optional[Dict[str, Tuple[float, float]]] = None,
+            max_retries: int = 3,
+            backoff: float = 1.0,
+            max_backoff: float = 30.0
+    ):
+        self.bucket = TokenBucket(rate, burst)
+        self.buckets = {
+            endpoint: TokenBucket(*budget) for endpoint, budget in {**DEFAULT_BUDGETS, **(budgets or {})}.items()
+        }
+        self.lanes = {endpoint: LaneMetrics() for endpoint in self.buckets}
+
+        self.max_retries = max_retries
+        self.backoff_base = backoff
+        self.max_backoff = max_backoff
+        self._consecutive_429 = 0
+
+    @staticmethod
+    def classify(method: str, url: str, signed: bool = False) -> str:
+        if urlsplit(url).path in _ORDER_PATHS:
+            if method == 'DELETE':
+                return CANCEL
+            if method == 'POST':
+                return ORDER
+
+        return PRIVATE if signed else PUBLIC
+
+    async def acquire(self, endpoint: str):
+        """
+        Waits until a request of the given endpoint class may be sent.
+
+        :param endpoint:
+        :return:
+        """
+
+        lane = self.lanes[endpoint]
+        lane.queued += 1
+        start = time.monotonic()
+
+        try:
+            await self.buckets[endpoint].acquire()
+            await self.bucket.acquire(PRIORITIES.get(endpoint, len(PRIORITIES)))
+        finally:
+            lane.queued -= 1
+
+        wait = time.monotonic() - start
+        lane.requests += 1
+        lane.total_wait += wait
+        lane.max_wait = max(lane.max_wait, wait)
+
+    def throttled(self, endpoint: str, retry_after: Optional[str] = None):
+        """
+        Registers a 429 response and pauses sending.
+
+        :param endpoint:
+        :param retry_after: value of the Retry-After header, if any
+        :return:
+        """
+
+        self.lanes[endpoint].throttled += 1
+        self._consecutive_429 += 1
+
+        try:
+            delay = float(retry_after)
+        except (TypeError, ValueError):
+            delay = min(self.backoff_base * 2 ** (self._consecutive_429 - 1), self.max_backoff)
+
+        self.bucket.pause(delay)
+
+    def succeeded(self):
+        self._consecutive_429 = 0
+
+    def metrics(self) -> dict:
+        return {
+            'queue_depth': sum(lane.queued for lane in self.lanes.values()),
+            'lanes': {endpoint: lane.as_dict() for endpoint, lane in self.lanes.items()},
+        }
@@ -0,0 +1,89 @@
+import asyncio
+import json
+import random
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import aiohttp
+
+from backpack.base.models import BackpackError
+from .transport import ReplayResponse
+
+# total seconds allowed per request, retries included, by endpoint path
+DEFAULT_DEADLINES = {
+    '/api/v1/order': 5,
+    '/api/v1/orders': 5,
+    '/api/v1/depth': 5,
+    '/api/v1/ticker': 3,
+    '/api/v1/ping': 2,
+    '/api/v1/time': 2,
+}
+
+RETRY_STATUSES = frozenset((500, 502, 503, 504))
+
+
+class RetryPolicy:
+    """
+    Deadlines and retries of client requests.
+
+    Every request gets the deadline of its endpoint, covering all of its attempts. Safe reads (GET)
+    failing with a network error, a timeout or a 5xx status are retried with full-jitter exponential
+    backoff while the deadline allows. Other methods are never retried blindly; order placement
+    uses ``clientId`` lookups instead (see ``BackpackPrivate.execute_order``).
+    """
+
+    retryable_errors = (aiohttp.ClientError, asyncio.TimeoutError)
+
+    def __init__(
+            self,
+            deadlines: Optional[Dict[str, float]] = None,
+            default_deadline: float = 10,
+            max_retries: int = 3,
+            backoff: float = 0.1,
+            max_backoff: float = 2
+    ):
+        self.deadlines = {**DEFAULT_DEADLINES, **(deadlines or {})}
+        self.default_deadline = default_deadline
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+
+    def deadline(self, url: str) -> float:
+        return self.deadlines.get(urlsplit(url).path, self.default_deadline)
+
+    @staticmethod
+    def timeout(seconds: float) -> aiohttp.ClientTimeout:
+        return aiohttp.ClientTimeout(total=seconds)
+
+    @staticmethod
+    def is_safe(method: str) -> bool:
+        return method == 'GET'
+
+    @staticmethod
+    def should_retry(response) -> bool:
+        return response.status in RETRY_STATUSES
+
+    def is_ambiguous(self, error: BaseException) -> bool:
+        """
+        Whether a failed write may still have been executed by the exchange.
+        """
+
+        if isinstance(error, BackpackError):
+            return error.status in RETRY_STATUSES
+
+        return isinstance(error, self.retryable_errors)
+
+    def delay(self, attempt: int) -> float:
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+
+class RecoveredResponse(ReplayResponse):
+    """
+    Stands in for the response of an order submission whose outcome was unknown and that was found
+    by its ``clientId``, so raw clients get the same interface (``status``, ``json()``, ``text()``,
+    ``release()``) on every path. The body is the order as returned by the lookup.
+    """
+
+    def __init__(self, url: str, order: dict):
+        super().__init__('POST', url, 200, json.dumps(order).encode())
+        self.order = order
@@ -1,22 +1,121 @@
-from typing import Optional
+import asyncio
+from typing import TYPE_CHECKING, Callable, Dict, Optional, Union
 import aiohttp
-from aiohttp_proxy import ProxyConnector
 
-from .public import BackpackPublic
+from .connection import ConnectionStats, PoolSettings, create_session
+from .public import BackpackPublic, ResponseCache
 from .private import BackpackPrivate
 
+# optional subsystems are passed in by the caller, importing them here would only slow down the import
+if TYPE_CHECKING:
+    from .instrumentation import Instrumentation
+    from .markets import MarketIndex
+    from .proxy_pool import ProxyPool
+    from .rate_limiter import RateLimiter
+    from .resilience import RetryPolicy
+    from .websocket import BackpackWebsocket
+
 
 class Backpack(BackpackPrivate, BackpackPublic):
-    def __init__(self, api_key: Optional[str] = None, api_secret: Optional[str] = None, proxy: Optional[str] = None):
+    def __init__(
+            self,
+            api_key: Optional[str] = None,
+            api_secret: Optional[str] = None,
+            proxy: Optional[str] = None,
+            decode: bool = False,
+            rate_limiter: Optional['RateLimiter'] = None,
+            pool: Optional[PoolSettings] = None,
+            cache: Optional[ResponseCache] = None,
+            instrumentation: Optional['Instrumentation'] = None,
+            session: Union[aiohttp.ClientSession, Callable[[], aiohttp.ClientSession], None] = None,
+            proxy_pool: Optional['ProxyPool'] = None,
+            retry_policy: Optional['RetryPolicy'] = None,
+            windows: Optional[Dict[str, int]] = None,
+            markets: Optional['MarketIndex'] = None
+    ):
         self.proxy = proxy
+        self.decode = decode
+        self.rate_limiter = rate_limiter
+        self.cache = cache
+        self.instrumentation = instrumentation
+        self.proxy_pool = proxy_pool
+        self.retry_policy = retry_policy
+        self.markets = markets
+        self.pool = pool or PoolSettings()
+        self.connection_stats = ConnectionStats()
+        self._keep_warm_task: Optional[asyncio.Task] = None
+        # a session passed in (or a callable creating it on first use) is shared with other clients and is
+        # not closed by this one. It is used as is: connection_stats and instrumentation only see sessions
+        # created by the client, pass their trace_config() to shared sessions when creating them.
+        self._shared_session = session
 
-        super(Backpack, self).__init__(api_key, api_secret)
+        super(Backpack, self).__init__(api_key, api_secret, windows)
 
     def _init_session(self):
-        return aiohttp.ClientSession(
-            trust_env=True,
-            connector=ProxyConnector.from_url(self.proxy, ssl=False) if self.proxy else aiohttp.TCPConnector(ssl=False)
-        )
+        if self._shared_session is not None:
+            return self._shared_session() if callable(self._shared_session) else self._shared_session
+
+        trace_configs = [self.connection_stats.trace_config()]
+
+        if self.instrumentation is not None:
+            trace_configs.append(self.instrumentation.trace_config())
+
+        return create_session(self.proxy, self.pool, trace_configs)
+
+    async def warm_up(self, connections: int = 1):
+        """
+        Opens up to ``connections`` pooled connections by pinging the exchange concurrently,
+        so the first real requests do not pay for DNS, TCP and TLS setup.
+
+        :param connections:
+        :return:
+        """
+
+        async def ping():
+            response = await self._send('GET', self.API_URL + '/api/v1/ping')
+            await response.read()
+
+        await asyncio.gather(*(ping() for _ in range(connections)))
+
+    def start_keep_warm(self, interval: float = 15, connections: int = 1) -> asyncio.Task:
+        """
+        Pings the exchange every ``interval`` seconds so pooled connections are not closed as idle.
+        Keep ``interval`` below the pool ``keepalive_timeout``.
+
+        :param interval:
+        :param connections:
+        :return:
+        """
+
+        async def keep_warm():
+            while True:
+                await asyncio.sleep(interval)
+
+                try:
+                    await self.warm_up(connections)
+                except (aiohttp.ClientError, asyncio.TimeoutError):
+                    pass
+
+        if self._keep_warm_task is None:
+            self._keep_warm_task = asyncio.create_task(keep_warm())
+
+        return self._keep_warm_task
+
+    def websocket(self, **kwargs) -> 'BackpackWebsocket':
+        """
+        Creates a streaming client sharing this client's session and proxy.
+
+        :return:
+        """
+
+        from .websocket import BackpackWebsocket
+
+        return BackpackWebsocket(self, **kwargs)
 
     async def close(self):
-        await self.session.close()
+        if self._keep_warm_task is not None:
+            self._keep_warm_task.cancel()
+            self._keep_warm_task = None
+
+        if self._shared_session is None:
+            await super().close()
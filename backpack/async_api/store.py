@@ -0,0 +1,231 @@
+import os
+import re
+import time
+from pathlib import Path
+from typing import Optional, Union
+
+from backpack.base.arrays import (
+    KLINE_DTYPE, TRADE_DTYPE, columns_to_records, require_numpy, trades_to_records
+)
+from backpack.base.models import Interval
+from .public.klines import KLineDownloader
+
+
+class MarketDataStore:
+    """
+    Append-only on-disk store of candles and trades, one fixed-width binary file per symbol
+    (and interval for candles).
+
+    Reads memory-map the file and return NumPy record views without copying. Records are
+    stored in time order, so the memory-mapped timestamp column is the time index and range
+    lookups are binary searches over it.
+    """
+
+    def __init__(self, root: Union[str, os.PathLike]):
+        self.root = Path(root)
+        self._maps = {}
+
+    @staticmethod
+    def _name(value: str) -> str:
+        return re.sub(r'[^A-Za-z0-9_.-]', '_', value)
+
+    def _klines_path(self, symbol: str, interval: Union[Interval, str]) -> Path:
+        return self.root / 'klines' / f'{self._name(symbol)}_{Interval(interval).value}.bin'
+
+    def _trades_path(self, symbol: str) -> Path:
+        return self.root / 'trades' / f'{self._name(symbol)}.bin'
+
+    def _map(self, path: Path, dtype):
+        np = require_numpy()
+
+        size = path.stat().st_size if path.exists() else 0
+        count = size // dtype.itemsize
+
+        if count == 0:
+            return np.empty(0, dtype=dtype)
+
+        cached = self._maps.get(path)
+
+        if cached is None or len(cached) != count:
+            cached = self._maps[path] = np.memmap(path, dtype=dtype, mode='r', shape=(count,))
+
+        return cached
+
+    def _append(self, path: Path, records):
+        if not len(records):
+            return
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        size = path.stat().st_size if path.exists() else 0
+
+        with open(path, 'ab') as file:
+            # an interrupted write may have left a partial record, the next one must start on a record boundary
+            file.truncate(size - size % records.dtype.itemsize)
+            file.write(records.tobytes())
+
+    @staticmethod
+    def _range(records, start: Optional[int], end: Optional[int]):
+        np = require_numpy()
+
+        timestamps = records['timestamp']
+        lo = 0 if start is None else int(np.searchsorted(timestamps, start, side='left'))
+        hi = len(records) if end is None else int(np.searchsorted(timestamps, end, side='left'))
+
+        return records[lo:hi]
+
+    def read_klines(self, symbol: str, interval: Union[Interval, str],
+                    start: Optional[int] = None, end: Optional[int] = None):
+        """
+        Returns stored candles with ``start <= timestamp < end`` (epoch seconds) as a read-only
+        view of ``KLINE_DTYPE`` records.
+
+        :return:
+        """
+
+        return self._range(self._map(self._klines_path(symbol, interval), KLINE_DTYPE), start, end)
+
+    def read_trades(self, symbol: str, start: Optional[int] = None, end: Optional[int] = None):
+        """
+        Returns stored trades with ``start <= timestamp < end`` (epoch milliseconds) as a read-only
+        view of ``TRADE_DTYPE`` records.
+
+        :return:
+        """
+
+        return self._range(self._map(self._trades_path(symbol), TRADE_DTYPE), start, end)
+
+    def append_klines(self, symbol: str, interval: Union[Interval, str], columns: dict) -> int:
+        """
+        Appends columnar candles newer than the last stored one. Returns the number of candles written.
+
+        :return:
+        """
+
+        stored = self.read_klines(symbol, interval)
+        records = columns_to_records(columns, KLINE_DTYPE)
+
+        if len(stored):
+            records = records[records['timestamp'] > stored['timestamp'][-1]]
+
+        self._append(self._klines_path(symbol, interval), records)
+
+        return len(records)
+
+    def append_trades(self, symbol: str, records) -> int:
+        """
+        Appends ``TRADE_DTYPE`` records newer than the last stored trade. Returns the number of trades written.
+
+        :return:
+        """
+
+        stored = self.read_trades(symbol)
+        records = records[records['id'].argsort(kind='stable')]
+
+        if len(stored):
+            records = records[records['id'] > stored['id'][-1]]
+
+        self._append(self._trades_path(symbol), records)
+
+        return len(records)
+
+    async def sync_klines(self, client, symbol: str, interval: Union[Interval, str], start_time: int,
+                          end_time: Optional[int] = None, downloader: Optional[KLineDownloader] = None) -> int:
+        """
+        Downloads only the candles missing since the last stored one. Candles that are not closed
+        yet are not stored, so the append-only file never holds a partial candle.
+
+        :return: number of candles written
+        """
+
+        interval = Interval(interval)
+        end_time = min(end_time or int(time.time()), int(time.time()))
+        downloader = downloader or KLineDownloader(client)
+
+        stored = self.read_klines(symbol, interval)
+        if len(stored):
+            start_time = max(start_time, int(stored['timestamp'][-1]) + interval.seconds)
+
+        if start_time >= end_time:
+            return 0
+
+        columns = await downloader.download(symbol, interval, start_time, end_time)
+        closed = columns['timestamp'] + interval.seconds <= end_time
+
+        return self.append_klines(symbol, interval, {name: column[closed] for name, column in columns.items()})
+
+    async def sync_trades(self, client, symbol: str, limit: int = 1000, prefetch: int = 2,
+                          batch_size: int = 10000, since: Optional[int] = None,
+                          max_trades: Optional[int] = None) -> int:
+        """
+        Downloads trades newer than the last stored one, walking history from the newest trade backwards.
+
+        The first sync of a symbol has no stored trade to stop at and would walk the whole history,
+        so it stops at trades older than ``since`` (epoch milliseconds, like the trades' ``timestamp``)
+        or after ``max_trades`` trades. Later syncs always continue from the last stored trade, so the
+        stored history has no gaps.
+
+        History arrives newest first, so trades are spilled to a temporary file ``batch_size`` at a time
+        and appended in ascending order, again ``batch_size`` at a time, once the walk is complete.
+
+        :param client:
+        :param symbol:
+        :param limit: page size
+        :param prefetch:
+        :param batch_size:
+        :param since: oldest trade time of the first sync
+        :param max_trades: maximum number of trades of the first sync
+        :return: number of trades written
+        """
+
+        np = require_numpy()
+
+        path = self._trades_path(symbol)
+        spill = path.with_name(path.name + '.pending')
+        stored = self.read_trades(symbol)
+        last_id = int(stored['id'][-1]) if len(stored) else None
+
+        spill.parent.mkdir(parents=True, exist_ok=True)
+
+        try:
+            with open(spill, 'wb') as file:
+                rows = []
+                fetched = 0
+
+                async for trade in client.iter_historical_trades(symbol, limit=limit, prefetch=prefetch):
+                    raw = getattr(trade, 'raw', trade)
+
+                    if last_id is not None:
+                        if int(raw['id']) <= last_id:
+                            break
+                    elif since is not None and int(raw['timestamp']) < since:
+                        break
+                    elif max_trades is not None and fetched >= max_trades:
+                        break
+
+                    rows.append(trade)
+                    fetched += 1
+
+                    if len(rows) >= batch_size:
+                        file.write(trades_to_records(rows).tobytes())
+                        rows = []
+
+                file.write(trades_to_records(rows).tobytes())
+
+            count = spill.stat().st_size // TRADE_DTYPE.itemsize
+
+            if count == 0:
+                return 0
+
+            spilled = np.memmap(spill, dtype=TRADE_DTYPE, mode='r', shape=(count,))
+            order = np.argsort(spilled['id'], kind='stable')
+            written = 0
+
+            for i in range(0, count, batch_size):
+                written += self.append_trades(symbol, spilled[order[i:i + batch_size]])
+
+            del spilled
+
+            return written
+        finally:
+            spill.unlink(missing_ok=True)
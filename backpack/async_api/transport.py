@@ -0,0 +1,303 @@
+"""
+Record-and-replay transports usable as the client session, e.g. ``Backpack(session=ReplaySession(path))``.
+
+The log holds one JSON object per line, appended as responses arrive:
+
+    {"t": 1700000000.123, "d": 0.0213, "m": "GET", "k": "/api/v1/depth?symbol=SOL_USDC",
+     "s": 200, "c": "application/json", "b": "{...}"}
+
+``t`` is the start time, ``d`` the duration in seconds, ``k`` the request key (path and sorted
+query), ``s`` the status, ``c`` the content type and ``b`` the body (``b64`` instead for binary
+bodies). Failed requests store the error class in ``e`` instead of a response. Request headers and
+bodies are never written, so logs hold no API keys or signatures.
+"""
+
+import asyncio
+import base64
+import json
+import time
+from collections import defaultdict, deque
+from pathlib import Path
+from typing import Deque, Dict, Optional, Union
+from urllib.parse import urlencode, urlsplit
+
+import aiohttp
+
+from .connection import PoolSettings, create_session
+
+
+def request_key(method: str, url: str, params: Optional[dict] = None) -> str:
+    """
+    Key matching a replayed request to a recorded one: method, path and sorted query parameters.
+    Bodies are left out, so orders with generated client ids still match.
+    """
+
+    parts = urlsplit(url)
+    query = [tuple(pair.split('=', 1)) for pair in parts.query.split('&') if pair]
+
+    if params:
+        query.extend((key, str(value)) for key, value in params.items() if value is not None)
+
+    path = f'{method} {parts.path}'
+
+    return f'{path}?{urlencode(sorted(query))}' if query else path
+
+
+class _RequestContext:
+    # lets requests be awaited or used with `async with`, like aiohttp's request context manager
+    __slots__ = ('_coro', '_response')
+
+    def __init__(self, coro):
+        self._coro = coro
+        self._response = None
+
+    def __await__(self):
+        return self._coro.__await__()
+
+    async def __aenter__(self):
+        self._response = await self._coro
+        return self._response
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self._response.release()
+
+
+class _Session:
+    closed = False
+
+    async def _request(self, method: str, url: str, **kwargs):
+        raise NotImplementedError
+
+    def request(self, method: str, url: str, **kwargs) -> _RequestContext:
+        return _RequestContext(self._request(method, url, **kwargs))
+
+    def get(self, url: str, **kwargs) -> _RequestContext:
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> _RequestContext:
+        return self.request('POST', url, **kwargs)
+
+    def put(self, url: str, **kwargs) -> _RequestContext:
+        return self.request('PUT', url, **kwargs)
+
+    def delete(self, url: str, **kwargs) -> _RequestContext:
+        return self.request('DELETE', url, **kwargs)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def close(self):
+        self.closed = True
+
+
+class RecordingSession(_Session):
+    """
+    Sends requests through a real session and appends every exchange to the log at ``path``.
+
+    :param path: log file, appended to if it exists
+    :param session: session to send requests with; by default one is created and owned by the recorder
+    """
+
+    def __init__(self, path: Union[str, Path], session: Optional[aiohttp.ClientSession] = None,
+                 pool: Optional[PoolSettings] = None, proxy: Optional[str] = None):
+        self.path = Path(path)
+        self.records = 0
+
+        self._session = session
+        self._owns_session = session is None
+        self._pool = pool or PoolSettings()
+        self._proxy = proxy
+        self._file = self.path.open('a', encoding='utf-8')
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        if self._session is None:
+            self._session = create_session(self._proxy, self._pool)
+
+        return self._session
+
+    def _write(self, record: dict):
+        self._file.write(json.dumps(record, separators=(',', ':')) + '\n')
+        self._file.flush()
+        self.records += 1
+
+    async def _request(self, method: str, url: str, **kwargs):
+        record = {'t': round(time.time(), 6), 'm': method, 'k': request_key(method, url, kwargs.get('params'))}
+        start = time.perf_counter()
+
+        try:
+            response = await self.session.request(method, url, **kwargs)
+            # the body stays cached on the response, the caller can still read it
+            body = await response.read()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            record['d'] = round(time.perf_counter() - start, 6)
+            record['e'] = type(e).__name__
+            self._write(record)
+            raise
+
+        record['d'] = round(time.perf_counter() - start, 6)
+        record['s'] = response.status
+        record['c'] = response.content_type
+
+        try:
+            record['b'] = body.decode()
+        except UnicodeDecodeError:
+            record['b64'] = base64.b64encode(body).decode()
+
+        if 'Retry-After' in response.headers:
+            record['r'] = response.headers['Retry-After']
+
+        self._write(record)
+
+        return response
+
+    def ws_connect(self, *args, **kwargs):
+        # streams are passed through, not recorded
+        return self.session.ws_connect(*args, **kwargs)
+
+    async def close(self):
+        self._file.close()
+
+        if self._owns_session and self._session is not None:
+            await self._session.close()
+
+        await super().close()
+
+
+class ReplayResponse:
+    """
+    Recorded response with the parts of the ``aiohttp.ClientResponse`` interface the client uses.
+    """
+
+    def __init__(self, method: str, url: str, status: int, body: bytes, content_type: str = 'application/json',
+                 retry_after: Optional[str] = None):
+        self.method = method
+        self.url = url
+        self.status = status
+        self.content_type = content_type
+        self.headers = {'Content-Type': content_type}
+        self._body = body
+
+        if retry_after is not None:
+            self.headers['Retry-After'] = retry_after
+
+    @property
+    def ok(self) -> bool:
+        return self.status < 400
+
+    def raise_for_status(self):
+        if not self.ok:
+            raise aiohttp.ClientResponseError(None, (), status=self.status, message=self._body.decode(errors='replace'))
+
+    async def read(self) -> bytes:
+        return self._body
+
+    async def text(self, encoding: str = 'utf-8') -> str:
+        return self._body.decode(encoding)
+
+    async def json(self, loads=json.loads, **kwargs):
+        return loads(self._body)
+
+    def release(self):
+        pass
+
+    def close(self):
+        pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+
+class ReplayMiss(aiohttp.ClientConnectionError):
+    """
+    Raised when a replayed request has no recorded response left.
+    """
+
+
+_ERRORS = {
+    'TimeoutError': asyncio.TimeoutError,
+    'ServerTimeoutError': aiohttp.ServerTimeoutError,
+}
+
+
+class ReplaySession(_Session):
+    """
+    Serves recorded responses without any network access.
+
+    Requests are matched by method, path and query (see ``request_key``); responses recorded
+    for the same key are served in their recorded order. Recorded failures are raised again
+    as ``aiohttp.ClientConnectionError`` (or ``asyncio.TimeoutError`` for timeouts).
+
+    :param path: log written by ``RecordingSession``
+    :param speed: 1 replays with the recorded latency, 10 ten times faster, None without any delay
+    :param loop: start over from the first recorded response of a key once all were served,
+        e.g. for load tests longer than the recording
+    """
+
+    def __init__(self, path: Union[str, Path], speed: Optional[float] = 1.0, loop: bool = False):
+        self.path = Path(path)
+        self.speed = speed
+        self.loop = loop
+        self.served = 0
+        self.misses = 0
+
+        self._records: Dict[str, list] = defaultdict(list)
+
+        with self.path.open(encoding='utf-8') as file:
+            for line in file:
+                if line.strip():
+                    record = json.loads(line)
+                    self._records[record['k']].append(record)
+
+        self._queues: Dict[str, Deque[dict]] = {key: deque(records) for key, records in self._records.items()}
+
+    def __len__(self):
+        return sum(len(records) for records in self._records.values())
+
+    def _next(self, key: str) -> Optional[dict]:
+        queue = self._queues.get(key)
+
+        if not queue:
+            if not self.loop or key not in self._records:
+                return None
+
+            queue = self._queues[key] = deque(self._records[key])
+
+        return queue.popleft()
+
+    async def _request(self, method: str, url: str, **kwargs):
+        key = request_key(method, url, kwargs.get('params'))
+        record = self._next(key)
+
+        if record is None:
+            self.misses += 1
+            raise ReplayMiss(f'No recorded response left for {key}')
+
+        if self.speed:
+            await asyncio.sleep(record['d'] / self.speed)
+
+        self.served += 1
+
+        if 'e' in record:
+            raise _ERRORS.get(record['e'], aiohttp.ClientConnectionError)(record['e'])
+
+        body = base64.b64decode(record['b64']) if 'b64' in record else record['b'].encode()
+
+        return ReplayResponse(method, url, record['s'], body, record.get('c', 'application/json'), record.get('r'))
+
+    def rewind(self):
+        """
+        Starts serving every key from its first recorded response again.
+        """
+
+        self._queues = {key: deque(records) for key, records in self._records.items()}
+
+    def ws_connect(self, *args, **kwargs):
+        # not a connection error, so a websocket fails at once instead of reconnecting forever
+        raise RuntimeError('Streams are not recorded and cannot be replayed')
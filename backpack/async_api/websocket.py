@@ -0,0 +1,247 @@
+import asyncio
+import json
+from typing import Dict, List, Optional
+
+import aiohttp
+
+_CLOSED = object()
+
+PRIVATE_PREFIX = 'account.'
+
+
+class Stream:
+    """
+    Async iterator over the messages of a single subscribed stream.
+
+    Messages are the ``data`` part of the exchange payload. If the consumer falls behind,
+    the oldest queued message is dropped and ``dropped`` is incremented.
+    """
+
+    def __init__(self, websocket: 'BackpackWebsocket', name: str, max_queue: int = 0):
+        self.websocket = websocket
+        self.name = name
+        self.dropped = 0
+        self._queue = asyncio.Queue(max_queue)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        message = await self._queue.get()
+
+        if message is _CLOSED:
+            raise StopAsyncIteration
+
+        return message
+
+    def _put(self, message):
+        if self._queue.full():
+            self._queue.get_nowait()
+            self.dropped += 1
+
+        self._queue.put_nowait(message)
+
+    def _close(self):
+        if self._queue.full():
+            self._queue.get_nowait()
+
+        self._queue.put_nowait(_CLOSED)
+
+    async def close(self):
+        await self.websocket.unsubscribe(self)
+
+
+class BackpackWebsocket:
+    """
+    Streaming client multiplexing many subscriptions over one WebSocket connection.
+
+    The connection is opened with the session of the given client, so proxy settings are shared
+    with the REST API. The connection is re-established on failure and every active stream is
+    subscribed again.
+
+    https://docs.backpack.exchange/#tag/Streams
+    """
+
+    WS_URL = 'wss://ws.backpack.exchange'
+
+    def __init__(
+            self,
+            client,
+            url: Optional[str] = None,
+            max_queue: int = 10000,
+            heartbeat: float = 30,
+            reconnect_delay: float = 0.5,
+            max_reconnect_delay: float = 30
+    ):
+        self.client = client
+        self.url = url or self.WS_URL
+        self.max_queue = max_queue
+        self.heartbeat = heartbeat
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+
+        self.reconnects = 0
+        self.connected = asyncio.Event()
+
+        self._streams: Dict[str, List[Stream]] = {}
+        self._ws: Optional[aiohttp.ClientWebSocketResponse] = None
+        self._task: Optional[asyncio.Task] = None
+        self._closed = False
+
+    async def subscribe(self, name: str) -> Stream:
+        """
+        Subscribes to the given stream, e.g. ``depth.SOL_USDC``, and returns an async iterator over its messages.
+
+        :param name:
+        :return:
+        """
+
+        stream = Stream(self, name, self.max_queue)
+        is_new = name not in self._streams
+        self._streams.setdefault(name, []).append(stream)
+
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        elif is_new and self._ws is not None:
+            await self._send('SUBSCRIBE', [name])
+
+        return stream
+
+    async def unsubscribe(self, stream: Stream):
+        streams = self._streams.get(stream.name, [])
+
+        if stream in streams:
+            streams.remove(stream)
+            stream._close()
+
+        if not streams and self._streams.pop(stream.name, None) is not None and self._ws is not None:
+            await self._send('UNSUBSCRIBE', [stream.name])
+
+    async def depth(self, symbol: str) -> Stream:
+        return await self.subscribe(f'depth.{symbol}')
+
+    async def trades(self, symbol: str) -> Stream:
+        return await self.subscribe(f'trade.{symbol}')
+
+    async def ticker(self, symbol: str) -> Stream:
+        return await self.subscribe(f'ticker.{symbol}')
+
+    async def k_lines(self, symbol: str, interval: str) -> Stream:
+        return await self.subscribe(f'kline.{interval}.{symbol}')
+
+    async def order_updates(self, symbol: Optional[str] = None) -> Stream:
+        """
+        Subscribes to the private order update stream, optionally for a single market.
+        Requires a client with an API secret.
+
+        :param symbol:
+        :return:
+        """
+
+        return await self.subscribe(f'account.orderUpdate.{symbol}' if symbol else 'account.orderUpdate')
+
+    def _message(self, method: str, params: list) -> dict:
+        message = {'method': method, 'params': params}
+
+        if method == 'SUBSCRIBE' and params[0].startswith(PRIVATE_PREFIX):
+            headers = self.client._sign_request('subscribe')
+            message['signature'] = [
+                headers['X-API-KEY'], headers['X-SIGNATURE'], headers['X-TIMESTAMP'], headers['X-WINDOW']
+            ]
+
+        return message
+
+    async def _send(self, method: str, params: list):
+        # private streams are signed, so they are subscribed separately from public ones
+        private = [name for name in params if name.startswith(PRIVATE_PREFIX)]
+        public = [name for name in params if not name.startswith(PRIVATE_PREFIX)]
+
+        try:
+            for names in (public, private):
+                if names:
+                    await self._ws.send_str(json.dumps(self._message(method, names)))
+        except (ConnectionError, RuntimeError):
+            # the reader loop notices the broken connection and resubscribes on reconnect
+            pass
+
+    async def _run(self):
+        try:
+            await self._read_loop()
+        finally:
+            # consumers must not wait forever on a reader that is gone
+            self._close_streams()
+
+    async def _read_loop(self):
+        delay = self.reconnect_delay
+
+        while not self._closed:
+            try:
+                async with self.client.session.ws_connect(self.url, heartbeat=self.heartbeat) as ws:
+                    self._ws = ws
+                    delay = self.reconnect_delay
+
+                    if self._streams:
+                        await self._send('SUBSCRIBE', list(self._streams))
+
+                    self.connected.set()
+
+                    async for msg in ws:
+                        if msg.type == aiohttp.WSMsgType.TEXT:
+                            try:
+                                message = json.loads(msg.data)
+                            except ValueError:
+                                # a malformed frame is skipped, the connection stays usable
+                                continue
+
+                            self._dispatch(message)
+                        elif msg.type in (aiohttp.WSMsgType.ERROR, aiohttp.WSMsgType.CLOSE):
+                            break
+            except (aiohttp.ClientError, asyncio.TimeoutError, ConnectionError):
+                pass
+            finally:
+                self._ws = None
+                self.connected.clear()
+
+            if self._closed:
+                break
+
+            self.reconnects += 1
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.max_reconnect_delay)
+
+    def _dispatch(self, message: dict):
+        if not isinstance(message, dict):
+            return
+
+        name = message.get('stream')
+
+        if name is None:
+            return
+
+        for stream in self._streams.get(name, ()):
+            stream._put(message.get('data'))
+
+    async def close(self):
+        self._closed = True
+
+        if self._ws is not None:
+            await self._ws.close()
+
+        if self._task is not None:
+            self._task.cancel()
+
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+            self._task = None
+
+        self._close_streams()
+
+    def _close_streams(self):
+        for streams in self._streams.values():
+            for stream in streams:
+                stream._close()
+
+        self._streams.clear()
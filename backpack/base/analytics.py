@@ -0,0 +1,283 @@
+"""
+Vectorized analytics on ``KLINE_DTYPE`` and ``TRADE_DTYPE`` record arrays.
+
+K-line timestamps are candle starts in epoch seconds, trade timestamps are epoch milliseconds.
+"""
+
+from typing import Optional, Tuple, Union
+
+from .arrays import KLINE_DTYPE, np, klines_to_records, require_numpy, trades_to_records
+from .decoder import read_json
+from .models import Interval
+
+
+async def read_klines(response) -> 'np.ndarray':
+    """
+    Decodes a ``get_k_lines`` result (raw response, JSON rows or ``KLine`` models) into ``KLINE_DTYPE`` records.
+    """
+
+    return klines_to_records(await read_json(response))
+
+
+async def read_trades(response) -> 'np.ndarray':
+    """
+    Decodes a ``get_recent_trades`` / ``get_historical_trades`` result (raw response, JSON rows or
+    ``Trade`` models) into ``TRADE_DTYPE`` records.
+    """
+
+    return trades_to_records(await read_json(response))
+
+
+def _is_klines(records: 'np.ndarray') -> bool:
+    return records.dtype.names == KLINE_DTYPE.names
+
+
+def _price_volume(records: 'np.ndarray') -> Tuple['np.ndarray', 'np.ndarray']:
+    if _is_klines(records):
+        # typical price of each candle
+        return (records['high'] + records['low'] + records['close']) / 3, records['volume']
+
+    return records['price'], records['quantity']
+
+
+def _rolling_sum(values: 'np.ndarray', window: int) -> 'np.ndarray':
+    sums = np.cumsum(values, dtype=np.float64)
+    sums[window:] = sums[window:] - sums[:-window]
+
+    return sums
+
+
+def vwap(records: 'np.ndarray', window: Optional[int] = None) -> Union[float, 'np.ndarray']:
+    """
+    Volume weighted average price of trades, or of candles using their typical price.
+
+    :param records: trade or k-line records
+    :param window: number of rows of a rolling VWAP; the whole array gives a single value
+    :return: the VWAP (NaN without volume), or one rolling value per row
+    """
+
+    require_numpy()
+
+    price, volume = _price_volume(records)
+    notional = price * volume
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        if window is None:
+            total = volume.sum()
+            return float(notional.sum() / total) if total else float('nan')
+
+        return _rolling_sum(notional, window) / _rolling_sum(volume, window)
+
+
+def resample(records: 'np.ndarray', interval: Union[Interval, str]) -> 'np.ndarray':
+    """
+    Aggregates k-lines into candles of a longer ``interval``, or builds candles from trades.
+    Buckets are aligned to the epoch (weeks start on Thursday, a month is 30 days) and empty
+    buckets are skipped.
+
+    :param records: k-line or trade records, sorted by time
+    :param interval:
+    :return: ``KLINE_DTYPE`` records
+    """
+
+    require_numpy()
+
+    seconds = Interval(interval).seconds
+
+    if _is_klines(records):
+        start = records['timestamp']
+        opens, highs, lows, closes, volumes = (records[name] for name in ('open', 'high', 'low', 'close', 'volume'))
+    else:
+        start = records['timestamp'] // 1000
+        opens = highs = lows = closes = records['price']
+        volumes = records['quantity']
+
+    candles = np.empty(0, dtype=KLINE_DTYPE)
+
+    if not len(records):
+        return candles
+
+    buckets = start - start % seconds
+    # first row of each bucket; rows are sorted so buckets are contiguous
+    first = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    last = np.r_[first[1:], len(records)] - 1
+
+    candles = np.empty(len(first), dtype=KLINE_DTYPE)
+    candles['timestamp'] = buckets[first]
+    candles['open'] = opens[first]
+    candles['high'] = np.maximum.reduceat(highs, first)
+    candles['low'] = np.minimum.reduceat(lows, first)
+    candles['close'] = closes[last]
+    candles['volume'] = np.add.reduceat(volumes, first)
+
+    return candles
+
+
+def log_returns(records: 'np.ndarray') -> 'np.ndarray':
+    """
+    Log returns between consecutive closes (k-lines) or prices (trades).
+    """
+
+    require_numpy()
+
+    prices = records['close'] if _is_klines(records) else records['price']
+
+    return np.diff(np.log(prices))
+
+
+def rolling_volatility(records: 'np.ndarray', window: int, periods_per_year: Optional[float] = None) -> 'np.ndarray':
+    """
+    Standard deviation of log returns over a rolling ``window`` of returns.
+
+    :param records: k-line or trade records
+    :param window:
+    :param periods_per_year: annualizes the result, e.g. ``365 * 24`` for hourly candles
+    :return: one value per return, NaN until the window is full
+    """
+
+    require_numpy()
+
+    returns = log_returns(records)
+    volatility = np.full(len(returns), np.nan)
+
+    if len(returns) >= window > 1:
+        windows = np.lib.stride_tricks.sliding_window_view(returns, window)
+        volatility[window - 1:] = windows.std(axis=1, ddof=1)
+
+    if periods_per_year is not None:
+        volatility *= np.sqrt(periods_per_year)
+
+    return volatility
+
+
+def trade_flow_imbalance(trades: 'np.ndarray', interval: Union[Interval, str, None] = None):
+    """
+    Imbalance between aggressive buy and sell volume, ``(buy - sell) / (buy + sell)`` in [-1, 1].
+    A trade is a buy when the buyer is the taker (``is_buyer_maker`` is false).
+
+    :param trades: trade records
+    :param interval: bucket size; without it the imbalance of all trades is returned
+    :return: the imbalance, or bucket starts (epoch seconds) and the imbalance of each bucket
+    """
+
+    require_numpy()
+
+    signed = np.where(trades['is_buyer_maker'], -trades['quantity'], trades['quantity'])
+
+    if interval is None:
+        total = trades['quantity'].sum()
+        return float(signed.sum() / total) if total else 0.0
+
+    seconds = Interval(interval).seconds
+    start = trades['timestamp'] // 1000
+    buckets, index = np.unique(start - start % seconds, return_inverse=True)
+
+    net = np.bincount(index, weights=signed, minlength=len(buckets))
+    total = np.bincount(index, weights=trades['quantity'], minlength=len(buckets))
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return buckets, np.where(total > 0, net / total, 0.0)
+
+
+class KLineBuffer:
+    """
+    Preallocated, time-ordered k-line records updated in place as new candles arrive.
+
+    Updates of the latest (still open) candle overwrite it, newer candles are appended and older
+    ones are inserted by shifting the tail. The storage only grows, by doubling, when it is full;
+    with ``max_size`` the oldest candles are dropped instead, so it is never reallocated.
+    """
+
+    def __init__(self, capacity: int = 1024, max_size: Optional[int] = None):
+        require_numpy()
+
+        self.max_size = max_size
+        self._data = np.empty(max_size or capacity, dtype=KLINE_DTYPE)
+        self.size = 0
+
+    @property
+    def records(self) -> 'np.ndarray':
+        """
+        View of the stored candles (not a copy).
+        """
+
+        return self._data[:self.size]
+
+    def __len__(self):
+        return self.size
+
+    def _reserve(self, count: int = 1):
+        free = len(self._data) - self.size
+
+        if free >= count:
+            return
+
+        if self.max_size is not None:
+            drop = count - free
+            self._data[:self.size - drop] = self._data[drop:self.size]
+            self.size -= drop
+        else:
+            capacity = max(len(self._data), 1)
+
+            while capacity < self.size + count:
+                capacity *= 2
+
+            data = np.empty(capacity, dtype=KLINE_DTYPE)
+            data[:self.size] = self._data[:self.size]
+            self._data = data
+
+    def update(self, candle):
+        """
+        Merges one candle (a ``KLINE_DTYPE`` record or a tuple in its field order).
+        """
+
+        timestamps = self._data['timestamp']
+        timestamp = candle[0]
+
+        if self.size and timestamps[self.size - 1] == timestamp:
+            self._data[self.size - 1] = candle
+            return
+
+        if not self.size or timestamps[self.size - 1] < timestamp:
+            self._reserve()
+            self._data[self.size] = candle
+            self.size += 1
+            return
+
+        position = int(np.searchsorted(timestamps[:self.size], timestamp))
+
+        if timestamps[position] == timestamp:
+            self._data[position] = candle
+            return
+
+        if self.max_size is not None and self.size == len(self._data) and position == 0:
+            # older than everything kept
+            return
+
+        self._reserve()
+        position = int(np.searchsorted(timestamps[:self.size], timestamp))
+        self._data[position + 1:self.size + 1] = self._data[position:self.size]
+        self._data[position] = candle
+        self.size += 1
+
+    def merge(self, records: 'np.ndarray'):
+        """
+        Merges ``KLINE_DTYPE`` records, e.g. from ``read_klines`` or a k-line stream.
+        """
+
+        if len(records) == 0:
+            return
+
+        timestamps = records['timestamp']
+        newer = not self.size or timestamps[0] > self._data['timestamp'][self.size - 1]
+
+        if newer and np.all(timestamps[1:] > timestamps[:-1]):
+            # strictly newer, ordered candles are copied in one block
+            records = records[-len(self._data):] if self.max_size is not None else records
+            self._reserve(len(records))
+            self._data[self.size:self.size + len(records)] = records
+            self.size += len(records)
+            return
+
+        for candle in records:
+            self.update(candle)
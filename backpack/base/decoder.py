@@ -0,0 +1,60 @@
+try:
+    from orjson import loads
+except ImportError:
+    try:
+        from ujson import loads
+    except ImportError:
+        from json import loads
+
+from .models import BackpackError
+
+
+async def decode_response(response, model=None):
+    """
+    Reads the response body with the fastest available JSON parser and wraps it into ``model``.
+
+    Non-JSON bodies (e.g. ``pong``) are returned as text. Error statuses raise ``BackpackError``.
+
+    :param response:
+    :param model:
+    :return:
+    """
+
+    body = await response.read()
+
+    try:
+        data = loads(body)
+    except ValueError:
+        data = body.decode()
+
+    if response.status >= 400:
+        if isinstance(data, dict):
+            raise BackpackError(response.status, data.get('code'), data.get('message'))
+
+        raise BackpackError(response.status, message=data)
+
+    if model is None or data is None:
+        return data
+
+    return model.decode(data)
+
+
+async def read_json(result):
+    """
+    Returns the JSON of a request result, whether the client returns raw responses or decoded models.
+
+    :param result: raw response, model, list or dict of models or plain JSON
+    :return:
+    """
+
+    if hasattr(result, 'read'):
+        return await decode_response(result)
+
+    if isinstance(result, list):
+        return [getattr(row, 'raw', row) for row in result]
+
+    if isinstance(result, dict):
+        # decoded balances are models keyed by asset
+        return {key: getattr(value, 'raw', value) for key, value in result.items()}
+
+    return getattr(result, 'raw', result)
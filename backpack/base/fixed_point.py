@@ -0,0 +1,122 @@
+from decimal import Decimal
+from typing import Union
+
+_POW10 = [10 ** i for i in range(19)]
+
+
+def _pow10(decimals: int) -> int:
+    return _POW10[decimals] if decimals < len(_POW10) else 10 ** decimals
+
+
+def to_scaled(value: Union[str, int, Decimal], decimals: int) -> int:
+    """
+    Converts a decimal string such as ``"0.00001406"`` into an integer scaled by ``10 ** decimals``.
+
+    Raises ValueError if the value has more significant fractional digits than ``decimals``.
+    """
+
+    if isinstance(value, int):
+        return value * _pow10(decimals)
+
+    value = str(value)
+
+    if 'e' in value or 'E' in value:
+        value = format(Decimal(value), 'f')
+
+    negative = value.startswith('-')
+    if negative:
+        value = value[1:]
+
+    whole, _, fraction = value.partition('.')
+
+    if len(fraction) > decimals:
+        if fraction[decimals:].strip('0'):
+            raise ValueError(f"{value} has more than {decimals} decimal places")
+        fraction = fraction[:decimals]
+
+    scaled = int(whole or '0') * _pow10(decimals) + (int(fraction) * _pow10(decimals - len(fraction)) if fraction else 0)
+
+    return -scaled if negative else scaled
+
+
+def from_scaled(value: int, decimals: int) -> str:
+    """
+    Formats an integer scaled by ``10 ** decimals`` as a plain decimal string without trailing zeros.
+    """
+
+    sign = '-' if value < 0 else ''
+    whole, fraction = divmod(abs(value), _pow10(decimals))
+
+    if not fraction:
+        return f'{sign}{whole}'
+
+    return f'{sign}{whole}.' + str(fraction).rjust(decimals, '0').rstrip('0')
+
+
+def decimal_places(value: Union[str, int, Decimal]) -> int:
+    """
+    Number of significant fractional digits of a decimal string, e.g. 2 for ``"0.010"``.
+    """
+
+    value = str(value)
+
+    if 'e' in value or 'E' in value:
+        value = format(Decimal(value), 'f')
+
+    return len(value.partition('.')[2].rstrip('0'))
+
+
+ROUND_DOWN = 'down'
+ROUND_UP = 'up'
+ROUND_NEAREST = 'nearest'
+
+
+class Quantizer:
+    """
+    Rounds decimal values to multiples of an increment (a tick or step size) with integer math only.
+
+    ``Quantizer('0.01')('1.23456')`` gives ``'1.23'``.
+    """
+
+    __slots__ = ('increment', 'decimals', '_step')
+
+    def __init__(self, increment: Union[str, Decimal]):
+        self.increment = str(increment)
+        self.decimals = decimal_places(increment)
+        self._step = to_scaled(increment, self.decimals)
+
+        if self._step <= 0:
+            raise ValueError(f'Invalid increment: {increment}')
+
+    def steps(self, value: Union[str, int, Decimal], rounding: str = ROUND_NEAREST) -> int:
+        """
+        Number of increments in ``value`` after rounding.
+        """
+
+        # compare both at the precision of the finer of the two
+        decimals = max(decimal_places(value), self.decimals)
+        scaled = to_scaled(value, decimals)
+        step = self._step * _pow10(decimals - self.decimals)
+
+        match rounding:
+            case 'down':
+                return scaled // step
+            case 'up':
+                return -(-scaled // step)
+            case 'nearest':
+                return (scaled + step // 2) // step
+            case _:
+                raise ValueError(f"Invalid rounding: {rounding}. Must be 'down', 'up' or 'nearest'")
+
+    def scaled(self, value: Union[str, int, Decimal], rounding: str = ROUND_NEAREST) -> int:
+        """
+        Rounded value as an integer scaled by ``10 ** decimals``.
+        """
+
+        return self.steps(value, rounding) * self._step
+
+    def is_multiple(self, value: Union[str, int, Decimal]) -> bool:
+        return self.steps(value, ROUND_DOWN) == self.steps(value, ROUND_UP)
+
+    def __call__(self, value: Union[str, int, Decimal], rounding: str = ROUND_NEAREST) -> str:
+        return from_scaled(self.scaled(value, rounding), self.decimals)
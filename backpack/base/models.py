@@ -1,16 +1,376 @@
+import asyncio
+import time
+from decimal import Decimal
 from enum import Enum
+from typing import Optional
+from urllib.parse import urlsplit
+
+from .fixed_point import to_scaled
 
 
 class BaseClient:
     API_URL = 'https://api.backpack.exchange'
     API_TESTNET_URL = '_'
 
-    def __init__(self):
-        self.session = self._init_session()
+    # return typed models instead of raw aiohttp responses
+    decode = False
+    # optional RateLimiter scheduling every request
+    rate_limiter = None
+    # optional ResponseCache for public GET endpoints
+    cache = None
+    # optional Instrumentation recording request phase latencies
+    instrumentation = None
+    # optional ProxyPool routing requests through the fastest healthy proxy
+    proxy_pool = None
+    # optional RetryPolicy applying deadlines and retrying safe reads
+    retry_policy = None
+
+    _session = None
+
+    @property
+    def session(self):
+        """
+        The client session, created on first use so that constructing a client stays cheap.
+        """
+
+        if self._session is None:
+            self._session = self._init_session()
+
+        return self._session
+
+    @session.setter
+    def session(self, session):
+        self._session = session
 
     def _init_session(self):
         raise NotImplementedError
 
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def _request(self, method: str, url: str, model: Optional[type] = None, instruction: Optional[str] = None,
+                       **kwargs):
+        """
+        Sends a request through the client session.
+
+        In raw mode the ``aiohttp.ClientResponse`` is returned untouched. With ``decode`` enabled the body is
+        parsed and wrapped into ``model`` (plain JSON is returned for endpoints without a model).
+
+        Requests of private endpoints pass their ``instruction`` and are signed in ``_send``, right before every
+        attempt is dispatched, so neither retries nor time spent waiting for the rate limiter leave a stale timestamp.
+
+        :param method:
+        :param url:
+        :param model:
+        :param instruction: signing instruction of private endpoints
+        :return:
+        """
+
+        if self.retry_policy is None:
+            response = await self._fetch(method, url, instruction, **kwargs)
+        else:
+            response = await self._fetch_with_retries(method, url, instruction, **kwargs)
+
+        if not self.decode:
+            return response
+
+        from .decoder import decode_response
+
+        if self.instrumentation is None:
+            return await decode_response(response, model)
+
+        start = time.perf_counter()
+
+        try:
+            return await decode_response(response, model)
+        finally:
+            self.instrumentation.record(f'{method} {urlsplit(url).path}', 'body', time.perf_counter() - start)
+
+    async def _fetch(self, method: str, url: str, instruction: Optional[str] = None, **kwargs):
+        cache = self.cache
+
+        if (cache is not None and method == 'GET' and instruction is None and 'headers' not in kwargs
+                and (ttl := cache.ttl(url)) is not None):
+            return await cache.fetch(url, kwargs.get('params'), ttl, lambda: self._send(method, url, **kwargs))
+
+        return await self._send(method, url, instruction, **kwargs)
+
+    async def _fetch_with_retries(self, method: str, url: str, instruction: Optional[str], **kwargs):
+        policy = self.retry_policy
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + policy.deadline(url)
+        attempt = 0
+
+        while True:
+            kwargs['timeout'] = policy.timeout(max(deadline - loop.time(), 0.001))
+            retry = policy.is_safe(method) and attempt < policy.max_retries
+
+            try:
+                response = await self._fetch(method, url, instruction, **kwargs)
+            except policy.retryable_errors:
+                if not retry or loop.time() >= deadline:
+                    raise
+            else:
+                if not retry or not policy.should_retry(response) or loop.time() >= deadline:
+                    return response
+
+                response.release()
+
+            await asyncio.sleep(min(policy.delay(attempt), max(deadline - loop.time(), 0)))
+            attempt += 1
+
+    def _sign_request(self, instruction: str, body: Optional[dict] = None,
+                      encoded_body: Optional[str] = None) -> dict:
+        raise NotImplementedError
+
+    async def _send(self, method: str, url: str, instruction: Optional[str] = None,
+                    encoded_body: Optional[str] = None, **kwargs):
+        instrumentation = self.instrumentation
+        limiter = self.rate_limiter
+
+        if instrumentation is not None:
+            kwargs['trace_request_ctx'] = f'{method} {urlsplit(url).path}'
+
+        if limiter is None:
+            if instruction is not None:
+                kwargs['headers'] = self._sign_attempt(instruction, kwargs, encoded_body)
+
+            return await self._dispatch(method, url, **kwargs)
+
+        endpoint = limiter.classify(method, url, signed=instruction is not None or 'headers' in kwargs)
+
+        for attempt in range(limiter.max_retries + 1):
+            if instrumentation is None:
+                await limiter.acquire(endpoint)
+            else:
+                start = time.perf_counter()
+                await limiter.acquire(endpoint)
+                instrumentation.record(kwargs['trace_request_ctx'], 'schedule', time.perf_counter() - start)
+
+            # signed once the slot is granted: a 429 pause or a long queue would expire an earlier signature
+            if instruction is not None:
+                kwargs['headers'] = self._sign_attempt(instruction, kwargs, encoded_body)
+
+            response = await self._dispatch(method, url, **kwargs)
+
+            if response.status != 429:
+                limiter.succeeded()
+                break
+
+            limiter.throttled(endpoint, response.headers.get('Retry-After'))
+
+            if attempt < limiter.max_retries:
+                response.release()
+
+        return response
+
+    def _sign_attempt(self, instruction: str, kwargs: dict, encoded_body: Optional[str] = None) -> dict:
+        body = kwargs.get('params') or kwargs.get('json')
+
+        if self.instrumentation is None:
+            return self._sign_request(instruction, body, encoded_body)
+
+        start = time.perf_counter()
+        headers = self._sign_request(instruction, body, encoded_body)
+        self.instrumentation.record(kwargs['trace_request_ctx'], 'sign', time.perf_counter() - start)
+
+        return headers
+
+    async def _dispatch(self, method: str, url: str, **kwargs):
+        if self.proxy_pool is None:
+            return await self.session.request(method, url, **kwargs)
+
+        return await self.proxy_pool.request(method, url, **kwargs)
+
+
+class BackpackError(Exception):
+    """
+    Error response of the exchange, raised only when responses are decoded.
+    """
+
+    def __init__(self, status: int, code: Optional[str] = None, message: Optional[str] = None):
+        self.status = status
+        self.code = code
+        self.message = message
+
+        super().__init__(f'{status} {code}: {message}')
+
+
+class DecimalField:
+    """
+    Reads a decimal string of the raw payload and converts it only when accessed.
+    """
+
+    __slots__ = ('key',)
+
+    def __init__(self, key: str):
+        self.key = key
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+
+        value = obj.raw.get(self.key)
+
+        return None if value is None else Decimal(value)
+
+
+class Field:
+    __slots__ = ('key',)
+
+    def __init__(self, key: str):
+        self.key = key
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+
+        return obj.raw.get(self.key)
+
+
+class ResponseModel:
+    """
+    Thin view over a decoded JSON object. Nothing is converted or copied until a field is read.
+    """
+
+    __slots__ = ('raw',)
+
+    def __init__(self, raw: dict):
+        self.raw = raw
+
+    @classmethod
+    def decode(cls, data):
+        if isinstance(data, list):
+            return [cls(item) for item in data]
+
+        return cls(data)
+
+    def scaled(self, name: str, decimals: int) -> Optional[int]:
+        """
+        Returns the decimal field ``name`` as an integer scaled by ``10 ** decimals``.
+        """
+
+        value = self.raw.get(getattr(type(self), name).key)
+
+        return None if value is None else to_scaled(value, decimals)
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self.raw == other.raw
+
+    def __repr__(self):
+        return f'{type(self).__name__}({self.raw!r})'
+
+
+class Ticker(ResponseModel):
+    __slots__ = ()
+
+    symbol = Field('symbol')
+    first_price = DecimalField('firstPrice')
+    last_price = DecimalField('lastPrice')
+    price_change = DecimalField('priceChange')
+    price_change_percent = DecimalField('priceChangePercent')
+    high = DecimalField('high')
+    low = DecimalField('low')
+    volume = DecimalField('volume')
+    quote_volume = DecimalField('quoteVolume')
+    trades = Field('trades')
+
+
+class Depth(ResponseModel):
+    __slots__ = ()
+
+    last_update_id = Field('lastUpdateId')
+
+    @property
+    def bids(self):
+        return [(Decimal(price), Decimal(size)) for price, size in self.raw['bids']]
+
+    @property
+    def asks(self):
+        return [(Decimal(price), Decimal(size)) for price, size in self.raw['asks']]
+
+
+class Trade(ResponseModel):
+    __slots__ = ()
+
+    id = Field('id')
+    price = DecimalField('price')
+    quantity = DecimalField('quantity')
+    quote_quantity = DecimalField('quoteQuantity')
+    timestamp = Field('timestamp')
+    is_buyer_maker = Field('isBuyerMaker')
+
+
+class KLine(ResponseModel):
+    __slots__ = ()
+
+    start = Field('start')
+    end = Field('end')
+    open = DecimalField('open')
+    high = DecimalField('high')
+    low = DecimalField('low')
+    close = DecimalField('close')
+    volume = DecimalField('volume')
+    quote_volume = DecimalField('quoteVolume')
+    trades = Field('trades')
+
+
+class Order(ResponseModel):
+    __slots__ = ()
+
+    id = Field('id')
+    client_id = Field('clientId')
+    symbol = Field('symbol')
+    side = Field('side')
+    order_type = Field('orderType')
+    time_in_force = Field('timeInForce')
+    status = Field('status')
+    price = DecimalField('price')
+    trigger_price = DecimalField('triggerPrice')
+    quantity = DecimalField('quantity')
+    quote_quantity = DecimalField('quoteQuantity')
+    executed_quantity = DecimalField('executedQuantity')
+    executed_quote_quantity = DecimalField('executedQuoteQuantity')
+    self_trade_prevention = Field('selfTradePrevention')
+    post_only = Field('postOnly')
+    created_at = Field('createdAt')
+
+
+class Fill(ResponseModel):
+    __slots__ = ()
+
+    trade_id = Field('tradeId')
+    order_id = Field('orderId')
+    symbol = Field('symbol')
+    side = Field('side')
+    price = DecimalField('price')
+    quantity = DecimalField('quantity')
+    fee = DecimalField('fee')
+    fee_symbol = Field('feeSymbol')
+    is_maker = Field('isMaker')
+    timestamp = Field('timestamp')
+
+
+class Balance(ResponseModel):
+    __slots__ = ()
+
+    available = DecimalField('available')
+    locked = DecimalField('locked')
+    staked = DecimalField('staked')
+
+    @classmethod
+    def decode(cls, data):
+        # balances are keyed by asset symbol
+        return {symbol: cls(balance) for symbol, balance in data.items()}
+
 
 # Symbol status (status)
 class SymbolStatus(Enum):
@@ -116,3 +476,30 @@ class Interval(Enum):
     THREE_DAY = "3d"
     ONE_WEEK = "1w"
     ONE_MONTH = "1month"
+
+    @property
+    def seconds(self) -> int:
+        """
+        Duration of one candle in seconds (a month is counted as 30 days).
+        """
+
+        return _INTERVAL_SECONDS[self.value]
+
+
+_INTERVAL_SECONDS = {
+    "1m": 60,
+    "3m": 3 * 60,
+    "5m": 5 * 60,
+    "15m": 15 * 60,
+    "30m": 30 * 60,
+    "1h": 3600,
+    "2h": 2 * 3600,
+    "4h": 4 * 3600,
+    "6h": 6 * 3600,
+    "8h": 8 * 3600,
+    "12h": 12 * 3600,
+    "1d": 86400,
+    "3d": 3 * 86400,
+    "1w": 7 * 86400,
+    "1month": 30 * 86400,
+}
@@ -0,0 +1,8 @@
+from .loop import EventLoopThread
+from .rest_api import Backpack
+
+
+__all__ = [
+    'Backpack',
+    'EventLoopThread'
+]
@@ -0,0 +1,103 @@
+import asyncio
+import concurrent.futures
+import threading
+from typing import Optional
+
+
+class EventLoopThread:
+    """
+    An event loop running forever in a daemon thread.
+
+    Coroutines are submitted from any thread with ``run``, which blocks until their result is ready.
+    The loop (and with it every session created on it) lives as long as the thread, so synchronous
+    callers keep their pooled connections between calls.
+    """
+
+    def __init__(self, name: str = 'backpack-loop'):
+        self.name = name
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _serve(loop: asyncio.AbstractEventLoop, ready: threading.Event):
+        asyncio.set_event_loop(loop)
+        loop.call_soon(ready.set)
+        loop.run_forever()
+
+    def start(self) -> asyncio.AbstractEventLoop:
+        """
+        Starts the thread unless it is running already.
+
+        :return: the running loop
+        """
+
+        with self._lock:
+            if self.loop is None:
+                loop = asyncio.new_event_loop()
+                ready = threading.Event()
+
+                thread = threading.Thread(target=self._serve, args=(loop, ready), name=self.name, daemon=True)
+                thread.start()
+                ready.wait()
+
+                self.loop, self._thread = loop, thread
+
+            return self.loop
+
+    def run(self, coro, timeout: Optional[float] = None):
+        """
+        Runs a coroutine in the loop and waits for its result. Safe to call from many threads at once.
+
+        :param coro:
+        :param timeout: seconds to wait before the coroutine is cancelled and ``TimeoutError`` raised
+        :return:
+        """
+
+        if self._thread is not None and threading.current_thread() is self._thread:
+            coro.close()
+            raise RuntimeError('EventLoopThread.run cannot be called from its own loop')
+
+        future = asyncio.run_coroutine_threadsafe(coro, self.start())
+
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise TimeoutError(f'No result within {timeout} seconds') from None
+
+    def stop(self):
+        """
+        Stops the loop and joins the thread.
+
+        :return:
+        """
+
+        with self._lock:
+            if self.loop is None:
+                return
+
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self._thread.join()
+            self.loop.close()
+
+            self.loop, self._thread = None, None
+
+
+_default: Optional[EventLoopThread] = None
+_default_lock = threading.Lock()
+
+
+def default_loop() -> EventLoopThread:
+    """
+    The loop thread shared by every synchronous client created without one.
+    """
+
+    global _default
+
+    with _default_lock:
+        if _default is None:
+            _default = EventLoopThread()
+
+        return _default
@@ -0,0 +1,97 @@
+import functools
+import inspect
+from typing import Iterator, Optional
+
+from backpack.async_api.rest_api import Backpack as AsyncBackpack
+from .loop import EventLoopThread, default_loop
+
+
+class Backpack:
+    """
+    Blocking client running an asynchronous ``Backpack`` on a background event loop.
+
+    Every method of the asynchronous client is available under the same name and signature, but
+    returns its result directly; ``iter_*`` methods return plain iterators. All calls are executed
+    on one long-lived loop (by default shared by every synchronous client of the process), so the
+    client's connection pool is reused across calls and the client can be used from many threads
+    at once.
+
+    Responses are always decoded, since raw ``aiohttp`` responses cannot be read outside the loop.
+    Other keyword arguments are passed to the asynchronous client.
+
+    :param loop_thread: loop to run on instead of the shared one
+    :param timeout: seconds to wait for any call before raising ``TimeoutError``
+    """
+
+    def __init__(
+            self,
+            api_key: Optional[str] = None,
+            api_secret: Optional[str] = None,
+            proxy: Optional[str] = None,
+            loop_thread: Optional[EventLoopThread] = None,
+            timeout: Optional[float] = None,
+            **kwargs
+    ):
+        self.loop_thread = loop_thread or default_loop()
+        self.timeout = timeout
+
+        kwargs['decode'] = True
+
+        async def create():
+            # the session has to be created inside the loop it will be used from
+            return AsyncBackpack(api_key, api_secret, proxy, **kwargs)
+
+        self.client: AsyncBackpack = self.loop_thread.run(create())
+
+    def _run(self, coro):
+        return self.loop_thread.run(coro, self.timeout)
+
+    def _iterate(self, iterator) -> Iterator:
+        try:
+            while True:
+                try:
+                    yield self._run(iterator.__anext__())
+                except StopAsyncIteration:
+                    return
+        finally:
+            self._run(iterator.aclose())
+
+    def __getattr__(self, name: str):
+        if name == 'client':
+            raise AttributeError(name)
+
+        attribute = getattr(self.client, name)
+
+        if not callable(attribute):
+            return attribute
+
+        if inspect.isasyncgenfunction(attribute):
+            @functools.wraps(attribute)
+            def method(*args, **kwargs):
+                return self._iterate(attribute(*args, **kwargs))
+        elif inspect.iscoroutinefunction(attribute):
+            @functools.wraps(attribute)
+            def method(*args, **kwargs):
+                return self._run(attribute(*args, **kwargs))
+        else:
+            # plain methods may touch loop-bound state (e.g. start tasks), so they run in the loop too
+            async def call(*args, **kwargs):
+                return attribute(*args, **kwargs)
+
+            @functools.wraps(attribute)
+            def method(*args, **kwargs):
+                return self._run(call(*args, **kwargs))
+
+        # resolved once per name, later lookups skip __getattr__
+        self.__dict__[name] = method
+
+        return method
+
+    def close(self):
+        self._run(self.client.close())
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
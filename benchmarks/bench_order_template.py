@@ -0,0 +1,52 @@
+"""
+Compares the per-order cost of building and signing an order through ``execute_order``'s path
+with submitting it from a pre-built ``OrderTemplate`` (no network involved).
+
+    python benchmarks/bench_order_template.py --number 20000
+"""
+
+import argparse
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from backpack import Backpack  # noqa: E402
+from backpack.async_api.private.signer import encode_body  # noqa: E402
+from keys import generate_secret  # noqa: E402
+
+
+def main(number: int):
+    client = Backpack(api_key='benchmark', api_secret=generate_secret())
+    template = client.order_template('SOL_USDC', 'buy', 'limit', 'GTC', post_only=True)
+
+    def build_payload():
+        return client._order_payload('SOL_USDC', 'buy', 'limit', '100.25', 42, '1.5', None, True, None, 'GTC')
+
+    def execute_order_path():
+        payload = build_payload()
+        return payload, client._sign_request('orderExecute', payload)
+
+    def template_payload():
+        payload = template.fields.copy()
+        payload['clientId'], payload['price'], payload['quantity'] = 42, '100.25', '1.5'
+        return payload
+
+    timings = {
+        'payload + encode (execute_order)': timeit.timeit(lambda: encode_body(build_payload()), number=number),
+        'payload + encode (template)': timeit.timeit(lambda: template.encode(template_payload()), number=number),
+        'payload + sign (execute_order)': timeit.timeit(execute_order_path, number=number),
+        'payload + sign (template)': timeit.timeit(lambda: template.build('100.25', '1.5', 42), number=number),
+    }
+
+    for name, seconds in timings.items():
+        print(f"{name:>34}: {seconds / number * 1e6:8.2f} us/order")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--number', type=int, default=20000, help='orders per measurement')
+
+    main(parser.parse_args().number)
@@ -0,0 +1,70 @@
+"""
+Compares the per-request cost of the original signing path with the precomputed Signer.
+
+    python benchmarks/bench_signing.py
+"""
+
+import base64
+import sys
+import time
+import timeit
+from pathlib import Path
+from urllib.parse import urlencode
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from backpack.async_api.private.signer import Signer  # noqa: E402
+from keys import generate_secret  # noqa: E402
+
+ORDER = {
+    'clientId': 4211,
+    'orderType': 'Limit',
+    'price': '0.0000130',
+    'quantity': '729',
+    'side': 'Bid',
+    'symbol': 'BONK_USDC',
+    'timeInForce': 'GTC',
+}
+
+
+def legacy_sign(private_key, verifying_key_b64, instruction, body=None):
+    timestamp = str(int(time.time() * 1000))
+    window = '5000'
+
+    body = {
+        'instruction': instruction,
+        **dict(sorted((body or {}).items())),
+        'timestamp': timestamp,
+        'window': window,
+    }
+    message = urlencode(body)
+    signature = private_key.sign(message.encode())
+    signature_b64 = base64.b64encode(signature).decode()
+
+    return {
+        'X-API-KEY': verifying_key_b64,
+        'X-TIMESTAMP': timestamp,
+        'X-WINDOW': window,
+        'Content-Type': 'application/json',
+        'X-SIGNATURE': signature_b64
+    }
+
+
+def main(number: int = 20000, batch: int = 20):
+    signer = Signer(generate_secret())
+    bodies = [ORDER] * batch
+
+    legacy = timeit.timeit(
+        lambda: legacy_sign(signer.private_key, signer.verifying_key_b64, 'orderExecute', ORDER), number=number
+    )
+    single = timeit.timeit(lambda: signer.sign('orderExecute', ORDER), number=number)
+    bulk = timeit.timeit(lambda: signer.sign_many('orderExecute', bodies), number=number // batch)
+
+    print(f"legacy _sign_request: {legacy / number * 1e6:8.2f} us/request")
+    print(f"Signer.sign:          {single / number * 1e6:8.2f} us/request")
+    print(f"Signer.sign_many:     {bulk / number * 1e6:8.2f} us/request (batches of {batch})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+"""
+Cold-start benchmark: time to import the package and to complete the first request,
+each measured in a fresh interpreter against the local mock exchange.
+
+    python benchmarks/bench_startup.py --runs 20 --max-import-ms 50 --max-client-import-ms 300
+
+With a ``--max-*`` budget the script exits with status 1 when the median exceeds it,
+so it can guard against import-time regressions in CI.
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from backpack.sync_api import EventLoopThread  # noqa: E402
+from mock_exchange import MockExchange  # noqa: E402
+
+# every snippet prints the measured seconds; it runs in a new interpreter each time
+SNIPPETS = {
+    'import backpack': '''
+import time
+start = time.perf_counter()
+import backpack
+print(time.perf_counter() - start)
+''',
+    'from backpack import Backpack': '''
+import time
+start = time.perf_counter()
+from backpack import Backpack
+print(time.perf_counter() - start)
+''',
+    'first request': '''
+import asyncio, sys, time
+start = time.perf_counter()
+from backpack import Backpack
+
+async def main():
+    async with Backpack() as client:
+        client.API_URL = sys.argv[1]
+        response = await client.get_ticker('SOL_USDC')
+        await response.read()
+
+asyncio.run(main())
+print(time.perf_counter() - start)
+''',
+}
+
+
+def measure(snippet: str, url: str) -> float:
+    output = subprocess.run(
+        [sys.executable, '-c', snippet, url], cwd=ROOT, capture_output=True, text=True, check=True
+    ).stdout
+
+    return float(output.split()[-1])
+
+
+def main(args) -> int:
+    loop = EventLoopThread('mock-exchange')
+    exchange = MockExchange()
+    url = loop.run(exchange.start())
+
+    budgets = {
+        'import backpack': args.max_import_ms,
+        'from backpack import Backpack': args.max_client_import_ms,
+        'first request': args.max_first_request_ms,
+    }
+    results = {}
+    failed = False
+
+    try:
+        for name, snippet in SNIPPETS.items():
+            samples = [measure(snippet, url) * 1e3 for _ in range(args.runs)]
+            median = statistics.median(samples)
+            results[name] = {'median_ms': median, 'min_ms': min(samples), 'max_ms': max(samples)}
+
+            budget = budgets.get(name)
+            over = budget is not None and median > budget
+            failed = failed or over
+
+            print(f"{name:>30}: {median:8.2f} ms median  ({min(samples):.2f} - {max(samples):.2f})"
+                  + (f"  over budget of {budget} ms" if over else ''))
+    finally:
+        loop.run(exchange.stop())
+        loop.stop()
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2))
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=10, help='fresh interpreters per measurement')
+    parser.add_argument('--max-import-ms', type=float, default=None)
+    parser.add_argument('--max-client-import-ms', type=float, default=None)
+    parser.add_argument('--max-first-request-ms', type=float, default=None)
+    parser.add_argument('--output', default=None)
+
+    sys.exit(main(parser.parse_args()))
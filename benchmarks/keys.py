@@ -0,0 +1,22 @@
+"""
+Throwaway API credentials for the benchmarks.
+"""
+
+import base64
+
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+from cryptography.hazmat.primitives import serialization
+
+
+def generate_secret() -> str:
+    """
+    Returns a new random Ed25519 private key, base64 encoded like a Backpack API secret.
+    """
+
+    return base64.b64encode(
+        Ed25519PrivateKey.generate().private_bytes(
+            encoding=serialization.Encoding.Raw,
+            format=serialization.PrivateFormat.Raw,
+            encryption_algorithm=serialization.NoEncryption()
+        )
+    ).decode()
@@ -0,0 +1,215 @@
+"""
+Local stand-in for the Backpack REST API serving the /api/v1/* and /wapi/v1/* routes
+with synthetic payloads of configurable size and a configurable response delay.
+
+    python benchmarks/mock_exchange.py --port 8080 --latency 0.002
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import time
+
+from aiohttp import web
+
+
+class MockExchange:
+    def __init__(self, latency: float = 0.0, depth_levels: int = 500, history_size: int = 10000,
+                 k_lines: int = 1000):
+        self.latency = latency
+        self.depth_levels = depth_levels
+        self.history_size = history_size
+        self.k_lines = k_lines
+        self.requests = 0
+
+        self._order_ids = itertools.count(1)
+        self._depth = json.dumps({
+            'asks': [[f'{100 + i * 0.01:.2f}', f'{1 + i % 7}.5'] for i in range(depth_levels)],
+            'bids': [[f'{99.99 - i * 0.01:.2f}', f'{1 + i % 5}.25'] for i in range(depth_levels)][::-1],
+            'lastUpdateId': '1000',
+        })
+
+    @staticmethod
+    def _ticker(symbol: str) -> dict:
+        return {
+            'symbol': symbol, 'firstPrice': '98.1', 'lastPrice': '100.01', 'priceChange': '1.91',
+            'priceChangePercent': '0.0195', 'high': '101.2', 'low': '97.4', 'volume': '123456.78',
+            'quoteVolume': '12345678.9', 'trades': 4567,
+        }
+
+    def _order(self, payload: dict, status: str = 'New') -> dict:
+        return {
+            'id': str(next(self._order_ids)),
+            'clientId': payload.get('clientId'),
+            'symbol': payload.get('symbol', 'SOL_USDC'),
+            'side': payload.get('side', 'Bid'),
+            'orderType': payload.get('orderType', 'Limit'),
+            'timeInForce': payload.get('timeInForce', 'GTC'),
+            'price': payload.get('price'),
+            'quantity': payload.get('quantity'),
+            'executedQuantity': '0',
+            'executedQuoteQuantity': '0',
+            'status': status,
+            'createdAt': int(time.time() * 1000),
+        }
+
+    def _page(self, request: web.Request, row) -> list:
+        limit = int(request.query.get('limit', 100))
+        offset = int(request.query.get('offset', 0))
+        end = min(offset + limit, self.history_size)
+
+        return [row(self.history_size - i) for i in range(offset, end)]
+
+    @web.middleware
+    async def middleware(self, request: web.Request, handler):
+        self.requests += 1
+
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        return await handler(request)
+
+    async def ping(self, request):
+        return web.Response(text='pong')
+
+    async def time(self, request):
+        return web.Response(text=str(int(time.time() * 1000)))
+
+    async def status(self, request):
+        return web.json_response({'status': 'Ok', 'message': None})
+
+    async def assets(self, request):
+        return web.json_response([{'symbol': 'SOL', 'tokens': []}, {'symbol': 'USDC', 'tokens': []}])
+
+    async def markets(self, request):
+        return web.json_response([{
+            'symbol': 'SOL_USDC', 'baseSymbol': 'SOL', 'quoteSymbol': 'USDC',
+            'filters': {
+                'price': {'minPrice': '0.01', 'maxPrice': None, 'tickSize': '0.01'},
+                'quantity': {'minQuantity': '0.01', 'maxQuantity': None, 'stepSize': '0.01'},
+            },
+        }])
+
+    async def ticker(self, request):
+        return web.json_response(self._ticker(request.query.get('symbol', 'SOL_USDC')))
+
+    async def tickers(self, request):
+        return web.json_response([self._ticker(f'SYM{i}_USDC') for i in range(100)])
+
+    async def depth(self, request):
+        return web.Response(text=self._depth, content_type='application/json')
+
+    async def klines(self, request):
+        start = int(request.query.get('startTime', 0))
+        end = int(request.query.get('endTime', start + 60 * self.k_lines))
+        rows = [{
+            'start': time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime(t)),
+            'end': time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime(t + 60)),
+            'open': '100.0', 'high': '101.0', 'low': '99.0', 'close': '100.5', 'volume': '12.5', 'trades': '10',
+        } for t in range(start - start % 60, end, 60)][:self.k_lines]
+
+        return web.json_response(rows)
+
+    @staticmethod
+    def _trade(trade_id: int) -> dict:
+        return {
+            'id': trade_id, 'price': '100.01', 'quantity': '0.5', 'quoteQuantity': '50.005',
+            'timestamp': 1700000000000 + trade_id, 'isBuyerMaker': trade_id % 2 == 0,
+        }
+
+    async def trades(self, request):
+        limit = int(request.query.get('limit', 100))
+
+        return web.json_response([self._trade(self.history_size - i) for i in range(limit)])
+
+    async def trades_history(self, request):
+        return web.json_response(self._page(request, self._trade))
+
+    async def capital(self, request):
+        return web.json_response({
+            'SOL': {'available': '10.5', 'locked': '1.5', 'staked': '0'},
+            'USDC': {'available': '1000.25', 'locked': '150', 'staked': '0'},
+        })
+
+    async def history(self, request):
+        return web.json_response(self._page(request, lambda i: {'id': str(i), 'status': 'Filled'}))
+
+    async def fills(self, request):
+        return web.json_response(self._page(request, lambda i: {'tradeId': i, 'orderId': str(i), 'price': '100'}))
+
+    async def order(self, request):
+        if request.method == 'GET':
+            return web.json_response(self._order(dict(request.query)))
+
+        payload = await request.json()
+
+        return web.json_response(self._order(payload, 'New' if request.method == 'POST' else 'Cancelled'))
+
+    async def orders(self, request):
+        if request.method == 'GET':
+            return web.json_response([self._order({'price': '100', 'quantity': '1'}) for _ in range(10)])
+
+        payload = await request.json()
+
+        if request.method == 'POST':
+            return web.json_response([self._order(order) for order in payload])
+
+        return web.json_response([self._order(payload, 'Cancelled') for _ in range(10)])
+
+    def app(self) -> web.Application:
+        app = web.Application(middlewares=[self.middleware])
+        app.router.add_get('/api/v1/ping', self.ping)
+        app.router.add_get('/api/v1/time', self.time)
+        app.router.add_get('/api/v1/status', self.status)
+        app.router.add_get('/api/v1/assets', self.assets)
+        app.router.add_get('/api/v1/markets', self.markets)
+        app.router.add_get('/api/v1/ticker', self.ticker)
+        app.router.add_get('/api/v1/tickers', self.tickers)
+        app.router.add_get('/api/v1/depth', self.depth)
+        app.router.add_get('/api/v1/klines', self.klines)
+        app.router.add_get('/api/v1/trades', self.trades)
+        app.router.add_get('/api/v1/trades/history', self.trades_history)
+        app.router.add_get('/api/v1/capital', self.capital)
+        app.router.add_route('*', '/api/v1/order', self.order)
+        app.router.add_route('*', '/api/v1/orders', self.orders)
+        app.router.add_get('/wapi/v1/capital/deposits', self.history)
+        app.router.add_get('/wapi/v1/capital/withdrawals', self.history)
+        app.router.add_get('/wapi/v1/history/orders', self.history)
+        app.router.add_get('/wapi/v1/history/fills', self.fills)
+
+        return app
+
+    async def start(self, host: str = '127.0.0.1', port: int = 0) -> str:
+        """
+        Starts serving in the running loop and returns the base URL.
+        """
+
+        self._runner = web.AppRunner(self.app(), access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+
+        port = site._server.sockets[0].getsockname()[1]
+
+        return f'http://{host}:{port}'
+
+    async def stop(self):
+        await self._runner.cleanup()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds added to every response')
+    parser.add_argument('--depth-levels', type=int, default=500)
+    parser.add_argument('--history-size', type=int, default=10000)
+    args = parser.parse_args()
+
+    exchange = MockExchange(args.latency, args.depth_levels, args.history_size)
+    web.run_app(exchange.app(), host=args.host, port=args.port, access_log=None)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,152 @@
+"""
+Throughput and latency benchmarks of the client against the local mock exchange.
+
+Every scenario runs at each concurrency level and reports requests/sec and p50/p99 latency.
+Pagination runs walk the whole trade history, so they report walks/sec and pages/sec instead.
+Results are written as JSON so runs of different versions can be compared.
+
+    python benchmarks/run.py --concurrency 1 8 32 --requests 2000 --output results.json
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import statistics
+import sys
+import time
+from importlib import metadata
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from backpack import Backpack  # noqa: E402
+from keys import generate_secret  # noqa: E402
+from mock_exchange import MockExchange  # noqa: E402
+
+
+async def public_get(client: Backpack):
+    response = await client.get_ticker('SOL_USDC')
+    await response.read()
+
+
+async def signed_order(client: Backpack):
+    response = await client.execute_order('SOL_USDC', 'buy', 'limit', price='100.01', quantity='0.5')
+    await response.read()
+
+
+async def depth_parse(client: Backpack):
+    response = await client.get_order_book_depth('SOL_USDC')
+    await response.json()
+
+
+async def pagination(client: Backpack):
+    async for _ in client.iter_historical_trades('SOL_USDC', limit=100, prefetch=2):
+        pass
+
+
+SCENARIOS = {
+    'public_get': public_get,
+    'signed_order': signed_order,
+    'depth_parse': depth_parse,
+    'pagination': pagination,
+}
+
+# scenarios whose runs are not single requests, reported in their own unit
+UNITS = {
+    'pagination': 'walks',
+}
+
+
+def percentile(samples: list, percent: float) -> float:
+    samples = sorted(samples)
+
+    return samples[min(int(len(samples) * percent / 100), len(samples) - 1)]
+
+
+async def run_scenario(client: Backpack, scenario, runs: int, concurrency: int, unit: str = 'requests') -> dict:
+    latencies = []
+    remaining = iter(range(runs))
+
+    async def worker():
+        for _ in remaining:
+            start = time.perf_counter()
+            await scenario(client)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    return {
+        unit: len(latencies),
+        'seconds': elapsed,
+        'rps' if unit == 'requests' else f'{unit}_per_s': len(latencies) / elapsed,
+        'mean_ms': statistics.fmean(latencies) * 1e3,
+        'p50_ms': percentile(latencies, 50) * 1e3,
+        'p99_ms': percentile(latencies, 99) * 1e3,
+    }
+
+
+async def main(args):
+    exchange = MockExchange(args.latency, args.depth_levels, args.history_size)
+    url = await exchange.start()
+
+    client = Backpack(api_key='benchmark', api_secret=generate_secret())
+    client.API_URL = url
+
+    try:
+        version = metadata.version('backpack-api')
+    except metadata.PackageNotFoundError:
+        version = 'dev'
+
+    results = {
+        'version': version,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'timestamp': int(time.time()),
+        'config': vars(args),
+        'scenarios': {},
+    }
+
+    try:
+        await client.warm_up(max(args.concurrency))
+
+        for name in args.scenarios:
+            unit = UNITS.get(name, 'requests')
+            # every pagination run walks the whole history, so fewer runs are needed
+            runs = max(args.requests // 100, 1) if name == 'pagination' else args.requests
+
+            for concurrency in args.concurrency:
+                sent = exchange.requests
+                result = await run_scenario(client, SCENARIOS[name], runs, concurrency, unit)
+                results['scenarios'].setdefault(name, {})[str(concurrency)] = result
+
+                if unit == 'requests':
+                    rate = f"{result['rps']:10.1f} req/s"
+                else:
+                    result['pages_per_s'] = (exchange.requests - sent) / result['seconds']
+                    rate = f"{result[f'{unit}_per_s']:10.1f} {unit}/s ({result['pages_per_s']:.1f} pages/s)"
+
+                print(f"{name:>14} c={concurrency:<4} {rate}  "
+                      f"p50 {result['p50_ms']:7.2f} ms  p99 {result['p99_ms']:7.2f} ms")
+    finally:
+        await client.close()
+        await exchange.stop()
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scenarios', nargs='+', choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument('--concurrency', nargs='+', type=int, default=[1, 8, 32])
+    parser.add_argument('--requests', type=int, default=1000, help='requests per scenario and concurrency level')
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds added by the mock to every response')
+    parser.add_argument('--depth-levels', type=int, default=500)
+    parser.add_argument('--history-size', type=int, default=10000)
+    parser.add_argument('--output', default='bench_results.json')
+
+    asyncio.run(main(parser.parse_args()))
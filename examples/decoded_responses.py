@@ -0,0 +1,21 @@
+import asyncio
+
+from backpack import Backpack
+
+
+async def main():
+    # decode=True returns typed models instead of raw aiohttp responses
+    backpack = Backpack(decode=True)
+
+    ticker = await backpack.get_ticker('BONK_USDC')
+    print("Last price:", ticker.last_price)  # Decimal('0.00001406'), converted only when read
+    print("Last price as scaled int:", ticker.scaled('last_price', 8))  # 1406
+
+    depth = await backpack.get_order_book_depth('BONK_USDC')
+    print("Bids:", depth.bids[:5])  # [(Decimal(...), Decimal(...)), ...]
+
+    await backpack.close()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,24 @@
+import asyncio
+
+from backpack import Backpack, RecordingSession, ReplaySession
+
+
+async def strategy(backpack: Backpack):
+    ticker = await backpack.get_ticker('SOL_USDC')
+    depth = await backpack.get_order_book_depth('SOL_USDC')
+    print("Last price:", ticker.last_price, "best bid:", depth.bids[-1])
+
+
+async def main():
+    # record a live session; the log holds responses and timings, never keys or signatures
+    async with RecordingSession('session.jsonl') as recorder:
+        async with Backpack(decode=True, session=recorder) as backpack:
+            await strategy(backpack)
+
+    # replay it offline, ten times faster than recorded (speed=None serves without delay)
+    async with Backpack(decode=True, session=ReplaySession('session.jsonl', speed=10)) as backpack:
+        await strategy(backpack)
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
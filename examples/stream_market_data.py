@@ -0,0 +1,29 @@
+import asyncio
+
+from backpack import Backpack
+
+
+async def main():
+    backpack = Backpack()
+    websocket = backpack.websocket()
+
+    # every stream shares one connection, which is re-established and resubscribed on failure
+    depth = await websocket.depth('SOL_USDC')
+    trades = await websocket.trades('SOL_USDC')
+
+    async def print_trades():
+        async for trade in trades:
+            print("Trade:", trade)  # {'e': 'trade', 's': 'SOL_USDC', 'p': '...', 'q': '...', ...}
+
+    task = asyncio.create_task(print_trades())
+
+    async for update in depth:
+        print("Depth update:", update)  # {'e': 'depth', 'a': [...], 'b': [...], 'U': ..., 'u': ..., ...}
+
+    task.cancel()
+    await websocket.close()
+    await backpack.close()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
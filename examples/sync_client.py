@@ -0,0 +1,23 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from backpack import SyncBackpack
+
+
+def main():
+    # one background event loop serves every call, so connections are reused between calls and threads
+    with SyncBackpack() as backpack:
+        print("Server time:", backpack.get_system_time())
+
+        with ThreadPoolExecutor(8) as executor:
+            tickers = executor.map(backpack.get_ticker, ['SOL_USDC', 'BTC_USDC', 'ETH_USDC'])
+
+            for ticker in tickers:
+                print(ticker.symbol, ticker.last_price)
+
+        for trade in backpack.iter_historical_trades('SOL_USDC', limit=100):
+            print(trade.price, trade.quantity)
+            break
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,42 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from backpack.base.arrays import KLINE_COLUMNS, columns_to_records, klines_to_columns, klines_to_records, merge_klines
+
+
+def kline(start, close: str = '1.5') -> dict:
+    return {
+        'start': start, 'open': '1', 'high': '2', 'low': '0.5', 'close': close, 'volume': '10.25',
+        'end': start, 'quoteVolume': '0', 'trades': '1',
+    }
+
+
+@pytest.mark.parametrize('start, timestamp', [
+    ('2024-01-01 00:00:00', 1704067200),
+    ('2024-01-01T01:00:00', 1704070800),
+    ('1704067200', 1704067200),
+    (1704067200, 1704067200),
+])
+def test_kline_start_is_decoded_to_epoch_seconds(start, timestamp):
+    assert klines_to_records([kline(start)])['timestamp'].tolist() == [timestamp]
+
+
+def test_columns_match_records():
+    rows = [kline('2024-01-01 00:00:00', '1.5'), kline('2024-01-01 00:01:00', '1.75')]
+    records = klines_to_records(rows)
+    columns = klines_to_columns(rows)
+
+    assert set(columns) == set(KLINE_COLUMNS)
+    assert columns['timestamp'].tolist() == [1704067200, 1704067260]
+    assert columns['close'].tolist() == [1.5, 1.75]
+    assert columns_to_records(columns, records.dtype).tolist() == records.tolist()
+
+
+def test_merge_keeps_the_first_chunk_for_duplicates():
+    first = klines_to_columns([kline(60, '1'), kline(120, '1')])
+    second = klines_to_columns([kline(0, '2'), kline(120, '2')])
+    merged = merge_klines(first, second, klines_to_columns([]))
+
+    assert merged['timestamp'].tolist() == [0, 60, 120]
+    assert merged['close'].tolist() == [2, 1, 1]
@@ -0,0 +1,177 @@
+import asyncio
+
+import pytest
+
+from backpack import ResponseCache
+
+
+class Response:
+    def __init__(self, n: int, status: int = 200):
+        self.n = n
+        self.status = status
+
+    async def read(self):
+        return b'{}'
+
+
+class Sender:
+    def __init__(self, delay: float = 0.0, status: int = 200):
+        self.delay = delay
+        self.status = status
+        self.sent = 0
+
+    async def __call__(self):
+        self.sent += 1
+        n = self.sent
+        await asyncio.sleep(self.delay)
+
+        return Response(n, self.status)
+
+
+URL = 'https://api.backpack.exchange/api/v1/ticker'
+
+
+def test_concurrent_identical_requests_are_sent_once():
+    cache = ResponseCache()
+    send = Sender(delay=0.01)
+
+    async def main():
+        return await asyncio.gather(*(cache.fetch(URL, {'symbol': 'SOL_USDC'}, 1, send) for _ in range(5)))
+
+    responses = asyncio.run(main())
+
+    assert send.sent == 1
+    assert all(response is responses[0] for response in responses)
+    assert cache.stats() == {'hits': 0, 'misses': 1, 'coalesced': 4, 'entries': 1}
+
+
+def test_different_params_are_not_coalesced():
+    cache = ResponseCache()
+    send = Sender()
+
+    async def main():
+        await cache.fetch(URL, {'symbol': 'SOL_USDC'}, 1, send)
+        await cache.fetch(URL, {'symbol': 'BTC_USDC'}, 1, send)
+
+    asyncio.run(main())
+
+    assert send.sent == 2
+
+
+def test_waiter_takes_over_when_the_leader_is_cancelled():
+    cache = ResponseCache()
+    send = Sender(delay=0.02)
+
+    async def main():
+        leader = asyncio.create_task(cache.fetch(URL, None, 1, send))
+        await asyncio.sleep(0)
+        waiters = [asyncio.create_task(cache.fetch(URL, None, 1, send)) for _ in range(3)]
+        await asyncio.sleep(0.005)
+        leader.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+
+        return await asyncio.gather(*waiters)
+
+    responses = asyncio.run(main())
+
+    # one waiter sent the request again, the others shared its response
+    assert send.sent == 2
+    assert [response.n for response in responses] == [2, 2, 2]
+
+
+def test_leader_error_reaches_waiters():
+    cache = ResponseCache()
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise ConnectionError('down')
+
+    async def main():
+        return await asyncio.gather(*(cache.fetch(URL, None, 1, fail) for _ in range(3)), return_exceptions=True)
+
+    results = asyncio.run(main())
+
+    assert all(isinstance(result, ConnectionError) for result in results)
+    assert cache.stats()['entries'] == 0
+
+
+def test_entries_expire():
+    cache = ResponseCache()
+    send = Sender()
+
+    async def main():
+        first = await cache.fetch(URL, None, 0.02, send)
+        cached = await cache.fetch(URL, None, 0.02, send)
+        await asyncio.sleep(0.03)
+        expired = await cache.fetch(URL, None, 0.02, send)
+
+        return first, cached, expired
+
+    first, cached, expired = asyncio.run(main())
+
+    assert cached is first
+    assert expired is not first
+    assert send.sent == 2
+
+
+def test_error_responses_are_not_cached():
+    cache = ResponseCache()
+    send = Sender(status=503)
+
+    async def main():
+        await cache.fetch(URL, None, 1, send)
+        await cache.fetch(URL, None, 1, send)
+
+    asyncio.run(main())
+
+    assert send.sent == 2
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = ResponseCache(max_entries=2)
+    send = Sender()
+
+    async def main():
+        for symbol in ('A', 'B'):
+            await cache.fetch(URL, {'symbol': symbol}, 10, send)
+
+        # A becomes the most recently used, so C evicts B
+        await cache.fetch(URL, {'symbol': 'A'}, 10, send)
+        await cache.fetch(URL, {'symbol': 'C'}, 10, send)
+        await cache.fetch(URL, {'symbol': 'A'}, 10, send)
+        await cache.fetch(URL, {'symbol': 'B'}, 10, send)
+
+    asyncio.run(main())
+
+    # A, B, C and B again
+    assert send.sent == 4
+    assert cache.stats()['entries'] == 2
+
+
+def test_invalidate_path():
+    cache = ResponseCache()
+    send = Sender()
+    markets = 'https://api.backpack.exchange/api/v1/markets'
+
+    async def main():
+        await cache.fetch(URL, None, 10, send)
+        await cache.fetch(markets, None, 10, send)
+        cache.invalidate('/api/v1/ticker')
+        await cache.fetch(URL, None, 10, send)
+        await cache.fetch(markets, None, 10, send)
+        cache.invalidate()
+
+    asyncio.run(main())
+
+    assert send.sent == 3
+    assert cache.stats()['entries'] == 0
+
+
+def test_ttl_by_endpoint_path():
+    cache = ResponseCache(ttls={'/api/v1/depth': 0.5})
+
+    assert cache.ttl(URL + '?symbol=SOL_USDC') == 1
+    assert cache.ttl('https://api.backpack.exchange/api/v1/depth') == 0.5
+    assert cache.ttl('https://api.backpack.exchange/api/v1/order') is None
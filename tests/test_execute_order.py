@@ -0,0 +1,78 @@
+import asyncio
+import json
+from urllib.parse import urlsplit
+
+import pytest
+
+from backpack import Backpack, RetryPolicy
+from backpack.async_api.transport import ReplayResponse
+from backpack.base.models import Order
+
+
+class Exchange:
+    """
+    Fails every order submission with 503 although the order is placed, as an overloaded gateway would.
+    """
+
+    def __init__(self, placed: bool = True):
+        self.placed = placed
+        self.submissions = []
+
+    async def dispatch(self, method, url, **kwargs):
+        path = urlsplit(url).path
+
+        if method == 'POST' and path == '/api/v1/order':
+            self.submissions.append(kwargs['json'])
+            return ReplayResponse(method, url, 503, b'{"code": "SERVICE_UNAVAILABLE", "message": "busy"}')
+
+        if method == 'GET' and path == '/api/v1/order':
+            client_id = kwargs['params']['clientId']
+
+            if self.placed and any(order['clientId'] == client_id for order in self.submissions):
+                body = {'id': '42', 'clientId': client_id, 'symbol': 'SOL_USDC', 'status': 'New'}
+                return ReplayResponse(method, url, 200, json.dumps(body).encode())
+
+            return ReplayResponse(method, url, 404, b'{"code": "RESOURCE_NOT_FOUND", "message": "not found"}')
+
+        if method == 'GET' and path == '/wapi/v1/history/orders':
+            return ReplayResponse(method, url, 200, b'[]')
+
+        raise AssertionError(f'unexpected request {method} {url}')
+
+
+def client(api_secret, exchange: Exchange, decode: bool) -> Backpack:
+    backpack = Backpack('key', api_secret, decode=decode, retry_policy=RetryPolicy(max_retries=2, backoff=0))
+    backpack._dispatch = exchange.dispatch
+
+    return backpack
+
+
+def execute(backpack: Backpack):
+    return asyncio.run(backpack.execute_order('SOL_USDC', 'buy', 'limit', '100', quantity='1', time_in_force='GTC'))
+
+
+@pytest.mark.parametrize('decode', [False, True])
+def test_ambiguous_failure_recovers_without_resubmitting(api_secret, decode):
+    exchange = Exchange()
+    result = execute(client(api_secret, exchange, decode))
+
+    assert len(exchange.submissions) == 1
+
+    if decode:
+        assert isinstance(result, Order) and result.id == '42'
+    else:
+        # raw clients get the response interface on the recovery path too
+        assert result.status == 200
+        assert asyncio.run(result.json())['id'] == '42'
+        assert json.loads(asyncio.run(result.text()))['clientId'] == exchange.submissions[0]['clientId']
+        result.release()
+
+
+def test_order_not_placed_is_resubmitted_with_the_same_client_id(api_secret):
+    exchange = Exchange(placed=False)
+    result = execute(client(api_secret, exchange, False))
+
+    assert len(exchange.submissions) == 3
+    assert len({order['clientId'] for order in exchange.submissions}) == 1
+    # nothing was found after the last attempt, its response is returned
+    assert result.status == 503
@@ -0,0 +1,101 @@
+import asyncio
+
+import aiohttp
+
+from backpack import LocalOrderBook
+
+
+class Client:
+    """
+    Serves depth snapshots with the given update ids in turn; ``None`` fails the request.
+    """
+
+    def __init__(self, *update_ids):
+        self.update_ids = list(update_ids)
+        self.requests = 0
+
+    async def get_order_book_depth(self, symbol):
+        update_id = self.update_ids[min(self.requests, len(self.update_ids) - 1)]
+        self.requests += 1
+
+        if update_id is None:
+            raise aiohttp.ClientConnectionError('snapshot failed')
+
+        return {'bids': [['10', '1']], 'asks': [['11', '1']], 'lastUpdateId': str(update_id)}
+
+
+class Stream:
+    def __init__(self, events):
+        self.events = list(events)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if not self.events:
+            raise StopAsyncIteration
+
+        return self.events.pop(0)
+
+    async def close(self):
+        pass
+
+
+class Websocket:
+    def __init__(self, *events):
+        self.events = events
+
+    async def depth(self, symbol):
+        return Stream(self.events)
+
+
+def event(first: int, last: int, bids=()) -> dict:
+    return {'U': first, 'u': last, 'b': list(bids), 'a': []}
+
+
+def run(client: Client, websocket: Websocket) -> LocalOrderBook:
+    book = LocalOrderBook(client, 'SOL_USDC', websocket=websocket, price_decimals=0, size_decimals=0,
+                          resync_delay=0.001)
+    asyncio.run(book.run())
+
+    return book
+
+
+def test_events_follow_the_snapshot():
+    book = run(Client(5), Websocket(event(4, 5), event(6, 7, [['10', '3']]), event(8, 8, [['9', '2']])))
+
+    assert book.resyncs == 1
+    assert book.last_update_id == 8
+    assert book.top(2)[0] == [(10, 3), (9, 2)]
+
+
+def test_gap_triggers_a_resync():
+    book = run(Client(5, 20), Websocket(event(6, 6), event(15, 16), event(21, 21, [['10', '4']])))
+
+    assert book.resyncs == 2
+    assert book.last_update_id == 21
+    assert book.best_bid() == (10, 4)
+
+
+def test_resync_catches_up_with_the_gap():
+    # the second snapshot (8) is older than the event revealing the gap (15), it is fetched again
+    client = Client(5, 8, 20)
+    book = run(client, Websocket(event(6, 6), event(15, 16), event(17, 21, [['10', '4']])))
+
+    assert client.requests == 3
+    assert book.last_update_id == 21
+    assert book.best_bid() == (10, 4)
+
+
+def test_failed_snapshots_are_retried():
+    client = Client(None, None, 5)
+    book = run(client, Websocket(event(6, 6)))
+
+    assert client.requests == 3
+    assert book.last_update_id == 6
+
+
+def test_book_is_unsynced_when_the_stream_ends():
+    book = run(Client(5), Websocket(event(6, 6)))
+
+    assert not book.synced.is_set()
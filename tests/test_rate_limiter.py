@@ -0,0 +1,43 @@
+import asyncio
+import time
+
+from backpack.async_api.rate_limiter import TokenBucket
+
+
+def release_times(bucket: TokenBucket, requests: int, pause: float) -> list:
+    async def main():
+        bucket.pause(pause)
+        start = time.monotonic()
+        times = []
+
+        async def request():
+            await bucket.acquire()
+            times.append(time.monotonic() - start)
+
+        await asyncio.gather(*(request() for _ in range(requests)))
+
+        return sorted(times)
+
+    return asyncio.run(main())
+
+
+def test_pause_does_not_end_in_a_burst():
+    times = release_times(TokenBucket(20, 20), 6, 0.2)
+
+    # nothing is granted during the pause
+    assert times[0] >= 0.2
+    # afterwards tokens accrue at the bucket rate instead of all at once
+    assert times[-1] >= 0.2 + 5 / 20 * 0.9
+
+
+def test_bucket_grants_the_burst_without_pause():
+    bucket = TokenBucket(20, 5)
+
+    async def main():
+        for _ in range(5):
+            await bucket.acquire()
+
+    start = time.monotonic()
+    asyncio.run(main())
+
+    assert time.monotonic() - start < 0.05
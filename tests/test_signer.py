@@ -0,0 +1,102 @@
+import base64
+import random
+import string
+from urllib.parse import urlencode
+
+import pytest
+
+from backpack import Backpack
+from backpack.async_api.private.signer import Signer, encode_body
+
+
+def reference(body: dict) -> str:
+    return urlencode(sorted(body.items()))
+
+
+@pytest.mark.parametrize('body', [
+    {},
+    {'symbol': 'SOL_USDC'},
+    {'symbol': 'SOL_USDC', 'limit': 100, 'offset': 0},
+    {'price': '0.0000130', 'quantity': 729, 'ratio': 1.5, 'tiny': 1e-07, 'big': 10 ** 20},
+    {'postOnly': True, 'reduceOnly': False},
+    {'address': 'a b+c/d=e&f?g#h%i', 'memo': 'ü€ 中文', 'tilde~dot.dash-under_': 'x~y'},
+    {'a key': 'v', 'b&key': 'w=x', 'ÄÖ': 'ok'},
+    {'clientId': 4294967295, 'side': 'Bid', 'orderType': 'Limit', 'timeInForce': 'GTC'},
+])
+def test_encode_body_matches_urlencode(body):
+    assert encode_body(body) == reference(body)
+
+
+def test_encode_body_matches_urlencode_on_random_payloads():
+    rng = random.Random(1)
+    alphabet = string.printable + 'äöüß€中'
+
+    def value():
+        return rng.choice([
+            ''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 12))),
+            rng.randint(-10 ** 12, 10 ** 12),
+            rng.uniform(-1e6, 1e6),
+            rng.choice([True, False]),
+        ])
+
+    for _ in range(500):
+        body = {''.join(rng.choice(alphabet) for _ in range(rng.randint(1, 8))): value() for _ in range(6)}
+
+        assert encode_body(body) == reference(body)
+
+
+def test_nested_values_fall_back_to_urlencode():
+    body = {'symbols': ['SOL_USDC', 'BTC_USDC'], 'symbol': 'SOL_USDC'}
+
+    assert encode_body(body) == reference(body)
+
+
+def test_template_encoding_equals_encode_body(api_secret):
+    client = Backpack('key', api_secret)
+    template = client.order_template('SOL_USDC', 'buy', 'limit', 'GTC', post_only=True, self_trade_prevention='Allow')
+
+    for values in (
+            {'clientId': 7, 'price': '100.25', 'quantity': '1.5'},
+            {'price': '0.0000130', 'quantity': 729},
+            {'quoteQuantity': '50', 'triggerPrice': '99.5'},
+            {},
+    ):
+        payload = {**template.fields, **values}
+
+        assert template.encode(payload) == encode_body(payload)
+
+
+def test_signature_verifies(api_secret):
+    signer = Signer(api_secret, windows={'orderExecute': 500})
+    body = {'symbol': 'SOL_USDC', 'side': 'Bid', 'price': '100.5', 'quantity': '2', 'postOnly': True}
+
+    headers = signer.sign('orderExecute', body)
+    message = (
+        f'instruction=orderExecute&{reference(body)}'
+        f'&timestamp={headers["X-TIMESTAMP"]}&window={headers["X-WINDOW"]}'
+    )
+
+    assert headers['X-WINDOW'] == '500'
+    assert headers['X-API-KEY'] == signer.verifying_key_b64
+    # raises InvalidSignature on mismatch
+    signer.verifying_key.verify(base64.b64decode(headers['X-SIGNATURE']), message.encode())
+
+
+def test_batch_signature_verifies(api_secret):
+    signer = Signer(api_secret)
+    bodies = [{'symbol': 'SOL_USDC', 'clientId': i, 'price': '1'} for i in range(3)]
+
+    headers = signer.sign_batch('orderExecute', bodies)
+    message = '&'.join(f'instruction=orderExecute&{reference(body)}' for body in bodies) + (
+        f'&timestamp={headers["X-TIMESTAMP"]}&window={headers["X-WINDOW"]}'
+    )
+
+    signer.verifying_key.verify(base64.b64decode(headers['X-SIGNATURE']), message.encode())
+
+
+def test_sign_without_body_verifies(api_secret):
+    signer = Signer(api_secret)
+    headers = signer.sign('balanceQuery')
+    message = f'instruction=balanceQuery&timestamp={headers["X-TIMESTAMP"]}&window={headers["X-WINDOW"]}'
+
+    signer.verifying_key.verify(base64.b64decode(headers['X-SIGNATURE']), message.encode())
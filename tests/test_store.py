@@ -0,0 +1,61 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip('numpy')
+
+from backpack import MarketDataStore
+
+
+class Client:
+    """
+    Serves ``history`` trades, ids 1 to ``history`` one second apart, newest first.
+    """
+
+    def __init__(self, history: int):
+        self.history = history
+        self.fetched = 0
+
+    async def iter_historical_trades(self, symbol: str, limit: int = 100, prefetch: int = 2):
+        for i in range(self.history, 0, -1):
+            self.fetched += 1
+
+            yield {'id': i, 'timestamp': i * 1000, 'price': '1.5', 'quantity': '2', 'isBuyerMaker': i % 2 == 0}
+
+
+def sync(store: MarketDataStore, client: Client, **kwargs) -> int:
+    return asyncio.run(store.sync_trades(client, 'SOL_USDC', batch_size=7, **kwargs))
+
+
+def test_first_sync_walks_the_whole_history(tmp_path):
+    store = MarketDataStore(tmp_path)
+
+    assert sync(store, Client(50)) == 50
+    assert store.read_trades('SOL_USDC')['id'].tolist() == list(range(1, 51))
+
+
+def test_first_sync_stops_at_since(tmp_path):
+    store = MarketDataStore(tmp_path)
+    client = Client(50)
+
+    assert sync(store, client, since=41_000) == 10
+    assert store.read_trades('SOL_USDC')['id'].tolist() == list(range(41, 51))
+    # stops at the first older trade instead of walking the rest of the history
+    assert client.fetched == 11
+
+
+def test_first_sync_stops_after_max_trades(tmp_path):
+    store = MarketDataStore(tmp_path)
+
+    assert sync(store, Client(50), max_trades=20) == 20
+    assert store.read_trades('SOL_USDC')['id'].tolist() == list(range(31, 51))
+
+
+def test_later_syncs_continue_from_the_last_stored_trade(tmp_path):
+    store = MarketDataStore(tmp_path)
+    sync(store, Client(50), max_trades=5)
+
+    # the cutoff only bounds the first sync, newer trades are never skipped
+    assert sync(store, Client(80), since=75_000, max_trades=5) == 30
+    assert store.read_trades('SOL_USDC')['id'].tolist() == list(range(46, 81))
+    assert not list((tmp_path / 'trades').glob('*.pending'))
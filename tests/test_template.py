@@ -0,0 +1,61 @@
+import asyncio
+
+from backpack import Backpack, RateLimiter
+
+
+class Throttled:
+    status = 429
+    headers = {'Retry-After': '0.01'}
+
+    def release(self):
+        pass
+
+
+class Accepted:
+    status = 200
+    headers = {}
+
+    def release(self):
+        pass
+
+
+def test_submit_signs_every_attempt(api_secret):
+    client = Backpack('key', api_secret, rate_limiter=RateLimiter(), windows={'orderExecute': 500})
+    template = client.order_template('SOL_USDC', 'buy', 'limit', 'GTC')
+    sent = []
+
+    async def dispatch(method, url, **kwargs):
+        sent.append(kwargs['headers'])
+        await asyncio.sleep(0.002)
+
+        return Throttled() if len(sent) == 1 else Accepted()
+
+    client._dispatch = dispatch
+
+    response = asyncio.run(template.submit('100.5', '2', client_id=7))
+
+    assert response.status == 200
+    assert len(sent) == 2
+    # the retry after the 429 pause carries a fresh timestamp and signature
+    assert sent[0]['X-TIMESTAMP'] != sent[1]['X-TIMESTAMP']
+    assert sent[0]['X-SIGNATURE'] != sent[1]['X-SIGNATURE']
+
+
+def test_submit_signs_like_execute_order(api_secret):
+    client = Backpack('key', api_secret)
+    template = client.order_template('SOL_USDC', 'buy', 'limit', 'GTC', post_only=True)
+    sent = []
+
+    async def dispatch(method, url, **kwargs):
+        sent.append(kwargs)
+        return Accepted()
+
+    client._dispatch = dispatch
+    client.signer.timestamp = lambda: '1700000000000'
+
+    asyncio.run(template.submit('100.5', '2', client_id=7))
+    asyncio.run(client.execute_order('SOL_USDC', 'buy', 'limit', '100.5', 7, '2', post_only=True,
+                                     time_in_force='GTC'))
+
+    assert sent[0]['json'] == sent[1]['json']
+    assert sent[0]['headers'] == sent[1]['headers']
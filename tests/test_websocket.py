@@ -0,0 +1,169 @@
+import asyncio
+import json
+
+from aiohttp import WSMsgType, web
+
+from backpack import Backpack, BackpackWebsocket, ReplaySession
+
+
+class MockStreams:
+    """
+    Local WebSocket endpoint recording every subscription. ``drop`` connections are closed
+    right after their first subscription to force a reconnect.
+    """
+
+    def __init__(self, drop: int = 0, frames=()):
+        self.drop = drop
+        self.frames = list(frames)
+        self.connections = 0
+        self.subscriptions = []
+
+        self._runner = None
+
+    async def handler(self, request):
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        self.connections += 1
+
+        async for msg in ws:
+            if msg.type != WSMsgType.TEXT:
+                continue
+
+            message = json.loads(msg.data)
+
+            if message['method'] != 'SUBSCRIBE':
+                continue
+
+            self.subscriptions.append((self.connections, message['params']))
+
+            if self.connections <= self.drop:
+                await ws.close()
+                break
+
+            for frame in self.frames:
+                await ws.send_str(frame)
+
+            for name in message['params']:
+                await ws.send_str(json.dumps({'stream': name, 'data': {'n': self.connections}}))
+
+        return ws
+
+    async def start(self) -> str:
+        app = web.Application()
+        app.router.add_get('/', self.handler)
+
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+
+        site = web.TCPSite(self._runner, '127.0.0.1', 0)
+        await site.start()
+
+        return f'ws://127.0.0.1:{self._runner.addresses[0][1]}/'
+
+    async def stop(self):
+        await self._runner.cleanup()
+
+
+def run(server: MockStreams, scenario):
+    async def main():
+        url = await server.start()
+
+        async with Backpack() as client:
+            websocket = BackpackWebsocket(client, url=url, reconnect_delay=0.01)
+
+            try:
+                return await asyncio.wait_for(scenario(websocket), 5)
+            finally:
+                await websocket.close()
+                await server.stop()
+
+    return asyncio.run(main())
+
+
+def test_reconnect_resubscribes_every_stream():
+    server = MockStreams(drop=1)
+
+    async def scenario(websocket):
+        depth = await websocket.depth('SOL_USDC')
+        trades = await websocket.trades('SOL_USDC')
+
+        return await anext(depth), await anext(trades), websocket.reconnects
+
+    depth, trade, reconnects = run(server, scenario)
+    names = ['depth.SOL_USDC', 'trade.SOL_USDC']
+
+    assert depth == {'n': 2} and trade == {'n': 2}
+    assert reconnects == 1
+    # the dropped connection is replaced and every active stream subscribed again
+    assert server.subscriptions == [(1, names), (2, names)]
+
+
+def test_malformed_frames_are_skipped():
+    server = MockStreams(frames=['not json', '[1, 2]', '"text"'])
+
+    async def scenario(websocket):
+        stream = await websocket.ticker('SOL_USDC')
+
+        return await anext(stream), websocket.reconnects
+
+    message, reconnects = run(server, scenario)
+
+    assert message == {'n': 1}
+    assert reconnects == 0
+
+
+def test_streams_close_when_the_reader_fails():
+    server = MockStreams()
+    ended = []
+
+    async def scenario(websocket):
+        def fail(message):
+            raise RuntimeError('reader failed')
+
+        websocket._dispatch = fail
+        stream = await websocket.depth('SOL_USDC')
+
+        # ends instead of blocking forever
+        ended.append([message async for message in stream])
+
+    try:
+        run(server, scenario)
+    except RuntimeError as e:
+        # close() surfaces the error of the reader task
+        assert str(e) == 'reader failed'
+    else:
+        raise AssertionError('the reader error was not raised')
+
+    assert ended == [[]]
+
+
+async def collect(stream) -> list:
+    return [message async for message in stream]
+
+
+def test_replayed_client_cannot_stream(tmp_path):
+    log = tmp_path / 'session.jsonl'
+    log.write_text('')
+
+    async def main():
+        client = Backpack()
+        client.session = ReplaySession(log, speed=None)
+        websocket = BackpackWebsocket(client, reconnect_delay=0.01)
+        stream = await websocket.depth('SOL_USDC')
+
+        # ends instead of reconnecting forever
+        messages = await asyncio.wait_for(collect(stream), 5)
+
+        try:
+            await websocket.close()
+        except RuntimeError as e:
+            return messages, websocket.reconnects, e
+
+        raise AssertionError('the replay error was not raised')
+
+    messages, reconnects, error = asyncio.run(main())
+
+    assert messages == []
+    assert reconnects == 0
+    assert type(error) is RuntimeError
+    assert str(error) == 'Streams are not recorded and cannot be replayed'